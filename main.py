@@ -7,17 +7,16 @@ Provides command-line interface for running scans, managing configuration, and m
 import argparse
 import sys
 import os
-from pathlib import Path
 
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
-
-from src.config.config_manager import ConfigManager, get_config
-from src.utils.logger import get_logger, log_info, log_error
+# Project modules are imported inside each command so that `--help` and
+# argument errors never pay for loading the configuration or logging setup.
 
 
 def setup_command(args):
     """Set up the initial configuration for Gmail."""
+    from src.config.config_manager import ConfigManager
+    from src.utils.logger import get_logger, log_error
+    
     logger = get_logger("setup")
     
     try:
@@ -52,6 +51,9 @@ def setup_command(args):
 
 def validate_command(args):
     """Validate the current configuration and test Gmail connection."""
+    from src.config.config_manager import ConfigManager
+    from src.utils.logger import get_logger, log_error
+    
     logger = get_logger("validate")
     
     try:
@@ -64,7 +66,7 @@ def validate_command(args):
         logger.info("Testing Gmail connection...")
         
         # Test Gmail connection
-        from email_processing.connector import GmailConnector
+        from src.email_processing.connector import GmailConnector
         
         connector = GmailConnector()
         if connector.test_connection():
@@ -84,11 +86,13 @@ def validate_command(args):
 
 def scan_command(args):
     """Run a manual email scan."""
+    from src.utils.logger import get_logger, log_error
+    
     logger = get_logger("scan")
     
     try:
         # Import here to avoid circular imports
-        from scheduler.jobs import run_email_scan
+        from src.scheduler.jobs import run_email_scan
         
         logger.info("Starting manual email scan...")
         result = run_email_scan()
@@ -106,11 +110,13 @@ def scan_command(args):
 
 def scheduler_command(args):
     """Start the scheduler to run scans automatically."""
+    from src.utils.logger import get_logger, log_error
+    
     logger = get_logger("scheduler")
     
     try:
         # Import here to avoid circular imports
-        from scheduler.main import start_scheduler
+        from src.scheduler.main import start_scheduler
         
         logger.info("Starting email scanner scheduler...")
         logger.info("Press Ctrl+C to stop the scheduler")
@@ -127,6 +133,8 @@ def scheduler_command(args):
 
 def status_command(args):
     """Show system status and statistics."""
+    from src.utils.logger import get_logger, log_error
+    
     logger = get_logger("status")
     
     try:
@@ -150,6 +158,9 @@ def status_command(args):
 
 def web_command(args):
     """Start the web interface."""
+    from src.config.config_manager import get_config
+    from src.utils.logger import get_logger, log_error
+    
     logger = get_logger("web")
     
     try:
@@ -159,7 +170,7 @@ def web_command(args):
             return False
         
         # Import here to avoid circular imports
-        from web.app import create_app, create_basic_templates
+        from src.web.app import create_app, create_basic_templates
         
         # Create templates if they don't exist
         create_basic_templates()
@@ -180,8 +191,53 @@ def web_command(args):
         return False
 
 
+# Available commands: name -> (handler, help text)
+COMMANDS = {
+    'setup': (setup_command, 'Set up initial configuration'),
+    'validate': (validate_command, 'Validate configuration'),
+    'scan': (scan_command, 'Run manual email scan'),
+    'scheduler': (scheduler_command, 'Start automated scheduler'),
+    'status': (status_command, 'Show system status'),
+    'web': (web_command, 'Start web interface'),
+}
+
+
 def main():
     """Main CLI entry point."""
+    parser = _build_parser(_sniff_subcommand(sys.argv))
+    
+    # Fast path: help needs nothing beyond argparse
+    if len(sys.argv) == 1 or sys.argv[1] in ('-h', '--help'):
+        parser.print_help()
+        return 1 if len(sys.argv) == 1 else 0
+    
+    args = parser.parse_args()
+    
+    if not args.command:
+        parser.print_help()
+        return 1
+    
+    # Run the selected command
+    success = args.func(args)
+    return 0 if success else 1
+
+
+def _sniff_subcommand(argv):
+    """Return the first positional token in argv (the subcommand), if any."""
+    for token in argv[1:]:
+        if not token.startswith('-'):
+            return token
+    return None
+
+
+def _build_parser(command=None) -> argparse.ArgumentParser:
+    """
+    Build the CLI argument parser using the standard library only.
+    
+    Args:
+        command: Subcommand to register; all commands are registered when
+            it is None or unknown so help and error messages stay complete.
+    """
     parser = argparse.ArgumentParser(
         description="Email Scanner & Blog Topic Generator",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -198,39 +254,14 @@ Examples:
     
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
-    # Setup command
-    setup_parser = subparsers.add_parser('setup', help='Set up initial configuration')
-    setup_parser.set_defaults(func=setup_command)
-    
-    # Validate command
-    validate_parser = subparsers.add_parser('validate', help='Validate configuration')
-    validate_parser.set_defaults(func=validate_command)
-    
-    # Scan command
-    scan_parser = subparsers.add_parser('scan', help='Run manual email scan')
-    scan_parser.set_defaults(func=scan_command)
-    
-    # Scheduler command
-    scheduler_parser = subparsers.add_parser('scheduler', help='Start automated scheduler')
-    scheduler_parser.set_defaults(func=scheduler_command)
-    
-    # Status command
-    status_parser = subparsers.add_parser('status', help='Show system status')
-    status_parser.set_defaults(func=status_command)
+    # Only register the requested command when it can be identified up front
+    names = [command] if command in COMMANDS else list(COMMANDS)
+    for name in names:
+        func, help_text = COMMANDS[name]
+        command_parser = subparsers.add_parser(name, help=help_text)
+        command_parser.set_defaults(func=func)
     
-    # Web command
-    web_parser = subparsers.add_parser('web', help='Start web interface')
-    web_parser.set_defaults(func=web_command)
-    
-    args = parser.parse_args()
-    
-    if not args.command:
-        parser.print_help()
-        return 1
-    
-    # Run the selected command
-    success = args.func(args)
-    return 0 if success else 1
+    return parser
 
 
 if __name__ == "__main__":
@@ -4,6 +4,6 @@ Handles topic generation using Gemini and OpenAI APIs.
 """
 
 from .topic_generator import TopicGenerator
-from .content_analyzer import ContentAnalyzer
+from .content_analyzer import ContentAnalyzer, EmailAnalysis
 
-__all__ = ['TopicGenerator', 'ContentAnalyzer'] 
\ No newline at end of file
+__all__ = ['TopicGenerator', 'ContentAnalyzer', 'EmailAnalysis'] 
\ No newline at end of file
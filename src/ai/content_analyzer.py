@@ -3,23 +3,98 @@ Content analyzer for email processing.
 Analyzes email content for relevance, quality, and topic generation potential.
 """
 
+import os
 import re
-from typing import Dict, Any, List, Optional
+import sys
+import hashlib
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
 from datetime import datetime
+from pathlib import Path
 
 from src.config.config_manager import get_config
 from src.utils.logger import get_logger
 
+try:
+    import ahocorasick
+except ImportError:  # optional accelerator, fall back to the regex scanner
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:  # optional accelerator, fall back to the regex scanner
+    hyperscan = None
+
+# Compiled Hyperscan databases are cached here between runs
+SCANNER_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'mail_scanner'
+
+
+@dataclass
+class EmailAnalysis:
+    """Result of analyzing a single email."""
+    
+    # Explicit slots (no field defaults) keep instances small on Python 3.9
+    __slots__ = (
+        'content_length', 'word_count', 'has_links', 'has_attachments',
+        'sender_domain', 'subject_keywords', 'body_keywords', 'relevance_score',
+        'category', 'quality_score', 'topic_potential'
+    )
+    
+    content_length: int
+    word_count: int
+    has_links: bool
+    has_attachments: bool
+    sender_domain: str
+    subject_keywords: List[str]
+    body_keywords: List[str]
+    relevance_score: float
+    category: str
+    quality_score: float
+    topic_potential: bool
+    
+    @classmethod
+    def empty(cls) -> "EmailAnalysis":
+        """Create an analysis with neutral values (used when analysis fails)."""
+        return cls(0, 0, False, False, '', [], [], 0.0, 'other', 0.0, False)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return asdict(self)
+
 
 class ContentAnalyzer:
     """Analyze email content for topic generation."""
     
+    # Maximum number of memoized analysis results kept per analyzer
+    CACHE_SIZE = 4096
+    # Batches up to this size are not worth a process pool
+    PARALLEL_THRESHOLD = 100
+    
+    # Sender domains that boost relevance: known sites (matched as the domain
+    # or one of its parents), generic words anywhere in the domain, and short
+    # labels that must match a whole label ('ai' must not match 'mail.com')
+    _DOMAIN_SUFFIXES = tuple('.' + domain for domain in (
+        'github.com', 'stackoverflow.com', 'medium.com', 'dev.to',
+        'techcrunch.com', 'wired.com', 'theverge.com', 'arstechnica.com',
+        'substack.com'
+    ))
+    _DOMAIN_SUBSTRINGS = ('newsletter', 'blog', 'tech', 'dev')
+    _DOMAIN_LABELS = frozenset({'ai'})
+    
+    _URL_RE = re.compile(r'https?://\S+', re.IGNORECASE)
+    _WORD_RE = re.compile(r'\S+')
+    
     def __init__(self):
         self.config = get_config()
         self.logger = get_logger("content_analyzer")
         
+        # LRU cache of analysis results keyed by a digest of the email content
+        self._cache: "OrderedDict[bytes, EmailAnalysis]" = OrderedDict()
+        
         # Keywords that indicate relevant content
-        self.tech_keywords = [
+        self.tech_keywords = self._intern_keywords([
             'python', 'javascript', 'react', 'vue', 'angular', 'node.js', 'docker',
             'kubernetes', 'aws', 'azure', 'gcp', 'machine learning', 'ai', 'ml',
             'data science', 'blockchain', 'cybersecurity', 'devops', 'api',
@@ -27,24 +102,40 @@ class ContentAnalyzer:
             'testing', 'deployment', 'microservices', 'serverless', 'cloud',
             'programming', 'coding', 'development', 'software', 'web', 'mobile',
             'startup', 'entrepreneurship', 'productivity', 'tools', 'automation'
-        ]
+        ])
         
-        self.newsletter_keywords = [
+        self.newsletter_keywords = self._intern_keywords([
             'newsletter', 'weekly', 'monthly', 'update', 'roundup', 'digest',
             'insights', 'trends', 'analysis', 'report', 'research', 'study',
             'survey', 'statistics', 'data', 'findings', 'recommendations',
             'best practices', 'tips', 'tricks', 'guide', 'tutorial', 'how-to'
-        ]
+        ])
         
-        self.professional_keywords = [
+        self.professional_keywords = self._intern_keywords([
             'career', 'leadership', 'management', 'strategy', 'business',
             'marketing', 'sales', 'finance', 'investment', 'consulting',
             'networking', 'professional development', 'skill', 'certification',
             'industry', 'market', 'competition', 'innovation', 'growth',
             'strategy', 'planning', 'execution', 'performance', 'metrics'
-        ]
+        ])
+        
+        # Keyword -> category lookup and a single alternation covering every
+        # keyword, so each text is scanned once instead of once per keyword.
+        # Longer keywords go first so 'data science' wins over 'data'.
+        self._kw_to_cat = (
+            {kw: 'tech' for kw in self.tech_keywords}
+            | {kw: 'newsletter' for kw in self.newsletter_keywords}
+            | {kw: 'professional' for kw in self.professional_keywords}
+        )
+        all_keywords = sorted(self._kw_to_cat, key=len, reverse=True)
+        self._kw_regex = re.compile(
+            r'\b(' + '|'.join(map(re.escape, all_keywords)) + r')\b'
+        )
+        self._all_keywords = tuple(all_keywords)
+        self._hs_db = self._build_hyperscan_db(self._all_keywords)
+        self._automaton = None if self._hs_db else self._build_automaton(self._all_keywords)
     
-    def analyze_email_content(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_email_content(self, email_data: Dict[str, Any]) -> EmailAnalysis:
         """
         Analyze email content for relevance and quality.
         
@@ -52,205 +143,348 @@ class ContentAnalyzer:
             email_data: Email data dictionary
             
         Returns:
-            Analysis results dictionary
+            Analysis results
         """
-        try:
-            subject = email_data.get('subject', '').lower()
-            body = email_data.get('body', '').lower()
-            sender = email_data.get('from', '').lower()
-            
-            # Basic content analysis
-            analysis = {
-                'content_length': len(body),
-                'word_count': len(body.split()),
-                'has_links': self._has_links(body),
-                'has_attachments': len(email_data.get('attachments', [])) > 0,
-                'sender_domain': self._extract_domain(sender),
-                'subject_keywords': self._extract_keywords(subject),
-                'body_keywords': self._extract_keywords(body),
-                'relevance_score': 0.0,
-                'category': 'other',
-                'quality_score': 0.0,
-                'topic_potential': False
-            }
-            
-            # Calculate relevance score
-            analysis['relevance_score'] = self._calculate_relevance_score(subject, body, sender)
-            
-            # Determine category
-            analysis['category'] = self._determine_category(subject, body, sender)
-            
-            # Calculate quality score
-            analysis['quality_score'] = self._calculate_quality_score(analysis)
-            
-            # Determine topic potential
-            analysis['topic_potential'] = self._has_topic_potential(analysis)
+        cache_key = self._cache_key(email_data)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            return replace(cached)
+        
+        analysis = self._compute_all(
+            (email_data.get('subject') or '').lower(),
+            (email_data.get('body') or '').lower(),
+            (email_data.get('from') or '').lower(),
+            bool(email_data.get('attachments'))
+        )
+        
+        self._cache[cache_key] = analysis
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        
+        return replace(analysis)
+    
+    def analyze_email_batch(self, emails: List[Dict[str, Any]]) -> List[EmailAnalysis]:
+        """
+        Analyze a batch of emails.
+        
+        Args:
+            emails: List of email data dictionaries
             
-            return analysis
+        Returns:
+            Analysis results in the same order as the input
+        """
+        analyses = []
+        for email_data in emails:
+            # One malformed email must not abort the rest of the batch
+            try:
+                analyses.append(self.analyze_email_content(email_data))
+            except Exception as e:
+                self.logger.error(f"Error analyzing email content: {e}")
+                analyses.append(EmailAnalysis.empty())
+        return analyses
+    
+    def analyze_many(self, emails: List[Dict[str, Any]], workers: Optional[int] = None) -> List[EmailAnalysis]:
+        """
+        Analyze a batch of emails across worker processes.
+        
+        Small batches are analyzed in-process, since starting the pool
+        costs more than the analysis itself.
+        
+        Args:
+            emails: List of email data dictionaries
+            workers: Number of worker processes (defaults to the CPU count)
             
+        Returns:
+            Analysis results in the same order as the input
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers < 2 or len(emails) <= self.PARALLEL_THRESHOLD:
+            return self.analyze_email_batch(emails)
+        
+        chunk_size = -(-len(emails) // workers)
+        chunks = [emails[i:i + chunk_size] for i in range(0, len(emails), chunk_size)]
+        
+        try:
+            with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+                return [analysis for chunk in pool.map(self._analyze_chunk, chunks) for analysis in chunk]
         except Exception as e:
-            self.logger.error(f"Error analyzing email content: {e}")
-            return {
-                'relevance_score': 0.0,
-                'category': 'other',
-                'quality_score': 0.0,
-                'topic_potential': False,
-                'error': str(e)
-            }
+            self.logger.warning(f"Parallel analysis failed, analyzing sequentially: {e}")
+            return self.analyze_email_batch(emails)
+    
+    def _analyze_chunk(self, emails: List[Dict[str, Any]]) -> List[EmailAnalysis]:
+        """Analyze one chunk of emails inside a worker process."""
+        return self.analyze_email_batch(emails)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Workers start with an empty cache; the scanners cannot be pickled
+        state = self.__dict__.copy()
+        state['_cache'] = OrderedDict()
+        state['_hs_db'] = None
+        state['_automaton'] = None
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._hs_db = self._build_hyperscan_db(self._all_keywords)
+        self._automaton = None if self._hs_db else self._build_automaton(self._all_keywords)
+    
+    def _cache_key(self, email_data: Dict[str, Any]) -> bytes:
+        """Build the cache key for an email from the fields the analysis reads."""
+        digest = hashlib.blake2b(digest_size=16)
+        for field in ('subject', 'from', 'body'):
+            digest.update((email_data.get(field) or '').encode('utf-8', 'ignore'))
+            digest.update(b'\0')
+        digest.update(b'1' if email_data.get('attachments') else b'0')
+        return digest.digest()
     
     def _extract_domain(self, email: str) -> str:
         """Extract domain from email address."""
-        try:
-            if '@' in email:
-                return email.split('@')[1]
-            return email
-        except:
-            return email
+        _, at, domain = email.rpartition('@')
+        # 'Name <user@example.com>' leaves the closing bracket on the domain
+        return domain.rstrip('> ') if at else email
     
-    def _extract_keywords(self, text: str) -> List[str]:
-        """Extract relevant keywords from text."""
-        keywords = []
-        text_lower = text.lower()
-        
-        # Check for tech keywords
-        for keyword in self.tech_keywords:
-            if keyword in text_lower:
-                keywords.append(keyword)
-        
-        # Check for newsletter keywords
-        for keyword in self.newsletter_keywords:
-            if keyword in text_lower:
-                keywords.append(keyword)
-        
-        # Check for professional keywords
-        for keyword in self.professional_keywords:
-            if keyword in text_lower:
-                keywords.append(keyword)
-        
-        return list(set(keywords))  # Remove duplicates
+    def _is_relevant_domain(self, domain: str) -> bool:
+        """Check whether a sender domain suggests relevant content."""
+        return (
+            ('.' + domain).endswith(self._DOMAIN_SUFFIXES)
+            or any(word in domain for word in self._DOMAIN_SUBSTRINGS)
+            or not self._DOMAIN_LABELS.isdisjoint(domain.split('.'))
+        )
     
-    def _has_links(self, text: str) -> bool:
-        """Check if text contains links."""
-        url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        return bool(re.search(url_pattern, text))
+    @staticmethod
+    def _intern_keywords(keywords: List[str]) -> Tuple[str, ...]:
+        """Lowercase and intern keywords once so scans never have to."""
+        return tuple(sys.intern(keyword.lower()) for keyword in keywords)
     
-    def _calculate_relevance_score(self, subject: str, body: str, sender: str) -> float:
-        """Calculate relevance score (0.0 to 1.0)."""
-        score = 0.0
+    @staticmethod
+    def _build_hyperscan_db(keywords: Tuple[str, ...]):
+        """
+        Compile every keyword into one Hyperscan database if hyperscan is installed.
         
-        # Subject relevance
-        subject_keywords = self._extract_keywords(subject)
-        if subject_keywords:
-            score += 0.3
+        Compiling dominates analyzer startup, so the serialized database is
+        cached on disk under a name derived from the keywords and reused
+        until they change.
+        """
+        if hyperscan is None:
+            return None
         
-        # Body relevance
-        body_keywords = self._extract_keywords(body)
-        if body_keywords:
-            score += 0.4
+        digest = hashlib.blake2b('\0'.join(keywords).encode('utf-8'), digest_size=16)
+        cache_path = SCANNER_CACHE_DIR / f"keywords-{digest.hexdigest()}.hsdb"
+        try:
+            db = hyperscan.loadb(cache_path.read_bytes(), hyperscan.HS_MODE_BLOCK)
+            db.scratch = hyperscan.Scratch(db)
+            return db
+        except Exception:
+            # Missing, unreadable or built by another hyperscan version
+            pass
         
-        # Content length (more content = higher score)
-        if len(body) > 100:
-            score += 0.1
-        if len(body) > 500:
-            score += 0.1
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[re.escape(keyword).encode('utf-8') for keyword in keywords],
+            ids=list(range(len(keywords))),
+            elements=len(keywords),
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(keywords)
+        )
         
-        # Sender domain relevance
-        domain = self._extract_domain(sender)
-        relevant_domains = [
-            'github.com', 'stackoverflow.com', 'medium.com', 'dev.to',
-            'techcrunch.com', 'wired.com', 'theverge.com', 'arstechnica.com',
-            'substack.com', 'newsletter', 'blog', 'tech', 'dev', 'ai'
-        ]
+        try:
+            SCANNER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(hyperscan.dumpb(db))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+        return db
+    
+    @staticmethod
+    def _build_automaton(keywords: Tuple[str, ...]):
+        """Build an Aho-Corasick automaton over keywords if pyahocorasick is installed."""
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    @staticmethod
+    def _is_word_char(char: str) -> bool:
+        return char.isalnum() or char == '_'
+    
+    @staticmethod
+    def _char_before(data: bytes, offset: int) -> str:
+        """Decode the UTF-8 character ending just before a byte offset."""
+        start = offset - 1
+        while start > 0 and 0x80 <= data[start] < 0xC0:
+            start -= 1
+        return data[max(start, 0):offset].decode('utf-8', 'ignore')
+    
+    @staticmethod
+    def _char_at(data: bytes, offset: int) -> str:
+        """Decode the UTF-8 character starting at a byte offset."""
+        if offset >= len(data):
+            return ''
+        lead = data[offset]
+        length = 1 if lead < 0xC0 else 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+        return data[offset:offset + length].decode('utf-8', 'ignore')
+    
+    def _scan(self, text: str) -> FrozenSet[str]:
+        """Return the set of relevant keywords found in text (which must already be lowercase)."""
+        if self._hs_db is not None:
+            # One pass over the UTF-8 bytes collecting whole-word hits
+            data = text.encode('utf-8', 'surrogatepass')
+            hits = []
+            self._hs_db.scan(data, match_event_handler=self._on_hyperscan_match, context=hits)
+            keywords = self._all_keywords
+            return self._leftmost_longest(
+                (start, end, keywords[pattern_id]) for pattern_id, start, end in hits
+                if not self._is_word_char(self._char_before(data, start))
+                and not self._is_word_char(self._char_at(data, end))
+            )
         
-        for relevant_domain in relevant_domains:
-            if relevant_domain in domain:
-                score += 0.1
-                break
+        if self._automaton is None:
+            return frozenset(self._kw_regex.findall(text))
         
-        return min(score, 1.0)
+        # One pass over the text collecting whole-word hits
+        last = len(text) - 1
+        hits = []
+        for end, keyword in self._automaton.iter(text):
+            start = end - len(keyword) + 1
+            if start > 0 and self._is_word_char(text[start - 1]):
+                continue
+            if end < last and self._is_word_char(text[end + 1]):
+                continue
+            hits.append((start, end + 1, keyword))
+        return self._leftmost_longest(hits)
     
-    def _determine_category(self, subject: str, body: str, sender: str) -> str:
-        """Determine the category of the email."""
-        tech_score = 0
-        newsletter_score = 0
-        professional_score = 0
-        
-        # Count keyword matches
-        all_text = f"{subject} {body}".lower()
+    @staticmethod
+    def _on_hyperscan_match(pattern_id: int, start: int, end: int, flags: int, hits: list):
+        hits.append((pattern_id, start, end))
+    
+    @staticmethod
+    def _leftmost_longest(hits) -> FrozenSet[str]:
+        """
+        Reduce (start, end, keyword) hits to leftmost-longest, non-overlapping
+        matches, like the regex scanner ('data science' does not also count as 'data').
+        """
+        found = set()
+        covered = 0
+        for start, neg_end, keyword in sorted((start, -end, keyword) for start, end, keyword in hits):
+            if start >= covered:
+                found.add(keyword)
+                covered = -neg_end
+        return frozenset(found)
+    
+    def _has_links(self, text: str) -> bool:
+        """Check if text contains links."""
+        # Callers pass lowercased text, so a plain substring check can rule out
+        # the common link-free email before running the regex
+        return 'http' in text and bool(self._URL_RE.search(text))
+    
+    def _compute_all(self, subject: str, body: str, sender: str, has_attachments: bool) -> EmailAnalysis:
+        """
+        Score lowercased email fields in a single pass.
         
-        for keyword in self.tech_keywords:
-            if keyword in all_text:
-                tech_score += 1
+        Each field is scanned for keywords once and every score is derived
+        from those results, instead of each step re-reading the email.
         
-        for keyword in self.newsletter_keywords:
-            if keyword in all_text:
-                newsletter_score += 1
+        Args:
+            subject: Lowercased subject
+            body: Lowercased body
+            sender: Lowercased sender address
+            has_attachments: Whether the email has attachments
+            
+        Returns:
+            Analysis results
+        """
+        subject_keywords = self._scan(subject)
+        body_keywords = self._scan(body)
+        sender_domain = self._extract_domain(sender)
+        content_length = len(body)
+        has_links = self._has_links(body)
         
-        for keyword in self.professional_keywords:
-            if keyword in all_text:
-                professional_score += 1
+        # Relevance score (0.0 to 1.0)
+        relevance_score = 0.0
+        if subject_keywords:
+            relevance_score += 0.3
+        if body_keywords:
+            relevance_score += 0.4
+        # More content = higher score
+        if content_length > 100:
+            relevance_score += 0.1
+        if content_length > 500:
+            relevance_score += 0.1
+        if self._is_relevant_domain(sender_domain):
+            relevance_score += 0.1
+        relevance_score = min(relevance_score, 1.0)
         
-        # Determine category based on scores
-        if tech_score > newsletter_score and tech_score > professional_score:
-            return 'tech'
-        elif newsletter_score > tech_score and newsletter_score > professional_score:
-            return 'newsletter'
-        elif professional_score > tech_score and professional_score > newsletter_score:
-            return 'professional'
+        # Category: count distinct keyword matches per category; a category
+        # only wins with a strictly higher score than the others
+        ranked = Counter(self._kw_to_cat[keyword] for keyword in subject_keywords | body_keywords).most_common(2)
+        if ranked and (len(ranked) == 1 or ranked[0][1] > ranked[1][1]):
+            category = ranked[0][0]
         else:
-            return 'other'
-    
-    def _calculate_quality_score(self, analysis: Dict[str, Any]) -> float:
-        """Calculate quality score (0.0 to 1.0)."""
-        score = 0.0
+            category = 'other'
         
-        # Content length
-        if analysis['content_length'] > 200:
-            score += 0.2
-        elif analysis['content_length'] > 100:
-            score += 0.1
-        
-        # Keyword density
-        keyword_count = len(analysis['subject_keywords']) + len(analysis['body_keywords'])
+        # Quality score (0.0 to 1.0)
+        quality_score = 0.0
+        if content_length > 200:
+            quality_score += 0.2
+        elif content_length > 100:
+            quality_score += 0.1
+        keyword_count = len(subject_keywords) + len(body_keywords)
         if keyword_count > 5:
-            score += 0.3
+            quality_score += 0.3
         elif keyword_count > 2:
-            score += 0.2
-        
-        # Has links (indicates more detailed content)
-        if analysis['has_links']:
-            score += 0.1
+            quality_score += 0.2
+        # Links indicate more detailed content
+        if has_links:
+            quality_score += 0.1
+        quality_score += relevance_score * 0.3
+        quality_score = min(quality_score, 1.0)
         
-        # Relevance score
-        score += analysis['relevance_score'] * 0.3
+        # Topic potential needs relevance, quality, a relevant category and enough content
+        topic_potential = (
+            relevance_score >= 0.3
+            and quality_score >= 0.3
+            and category in ('tech', 'newsletter', 'professional')
+            and content_length >= 100
+        )
         
-        return min(score, 1.0)
+        return EmailAnalysis(
+            content_length=content_length,
+            word_count=sum(1 for _ in self._WORD_RE.finditer(body)),
+            has_links=has_links,
+            has_attachments=has_attachments,
+            sender_domain=sender_domain,
+            subject_keywords=list(subject_keywords),
+            body_keywords=list(body_keywords),
+            relevance_score=relevance_score,
+            category=category,
+            quality_score=quality_score,
+            topic_potential=topic_potential
+        )
     
-    def _has_topic_potential(self, analysis: Dict[str, Any]) -> bool:
-        """Determine if email has potential for topic generation."""
-        # Must have sufficient relevance and quality
-        if analysis['relevance_score'] < 0.3:
-            return False
-        
-        if analysis['quality_score'] < 0.3:
-            return False
-        
-        # Must be in a relevant category
-        if analysis['category'] not in ['tech', 'newsletter', 'professional']:
-            return False
-        
-        # Must have sufficient content
-        if analysis['content_length'] < 100:
-            return False
-        
-        return True
-    
-    def should_process_for_topics(self, email_data: Dict[str, Any], analysis: Dict[str, Any]) -> bool:
+    def should_process_for_topics(self, email_data: Dict[str, Any], analysis: EmailAnalysis) -> bool:
         """Determine if email should be processed for topic generation."""
-        return analysis.get('topic_potential', False)
+        return analysis.topic_potential
     
-    def create_email_report(self, email_data: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a comprehensive report for an email."""
+    def create_email_report(self, email_data: Dict[str, Any], analysis: EmailAnalysis,
+                            batch_analyzed_at: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Create a comprehensive report for an email.
+        
+        Args:
+            email_data: Email data dictionary
+            analysis: Analysis results for the email
+            batch_analyzed_at: ISO timestamp shared by every report in a batch;
+                the current time is used when omitted
+            
+        Returns:
+            Email report dictionary
+        """
+        if batch_analyzed_at is None:
+            batch_analyzed_at = datetime.now().isoformat()
         try:
             return {
                 'email_id': email_data.get('id', ''),
@@ -258,16 +492,16 @@ class ContentAnalyzer:
                 'from': email_data.get('from', ''),
                 'date': email_data.get('date', ''),
                 'content': email_data.get('body', ''),
-                'category': analysis.get('category', 'other'),
-                'relevance_score': analysis.get('relevance_score', 0.0),
-                'quality_score': analysis.get('quality_score', 0.0),
-                'topic_potential': analysis.get('topic_potential', False),
-                'keywords': analysis.get('subject_keywords', []) + analysis.get('body_keywords', []),
-                'content_length': analysis.get('content_length', 0),
-                'word_count': analysis.get('word_count', 0),
-                'has_links': analysis.get('has_links', False),
-                'has_attachments': analysis.get('has_attachments', False),
-                'analyzed_at': datetime.now().isoformat()
+                'category': analysis.category,
+                'relevance_score': analysis.relevance_score,
+                'quality_score': analysis.quality_score,
+                'topic_potential': analysis.topic_potential,
+                'keywords': analysis.subject_keywords + analysis.body_keywords,
+                'content_length': analysis.content_length,
+                'word_count': analysis.word_count,
+                'has_links': analysis.has_links,
+                'has_attachments': analysis.has_attachments,
+                'analyzed_at': batch_analyzed_at
             }
             
         except Exception as e:
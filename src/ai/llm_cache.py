@@ -0,0 +1,102 @@
+"""
+Persistent cache for AI provider responses.
+Lets repeated prompts (e.g. recurring newsletters) skip the API call.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Any, Optional
+
+from src.utils.logger import get_logger
+
+
+class ResponseCache:
+    """SQLite-backed cache of raw AI responses keyed by a hash of the request."""
+    
+    def __init__(self, cache_dir: str, ttl_seconds: int):
+        self.logger = get_logger("llm_cache")
+        self.db_path = os.path.join(cache_dir, "llm_responses.db")
+        self.ttl_seconds = ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    @property
+    def enabled(self) -> bool:
+        """Caching is disabled with a non-positive TTL."""
+        return self.ttl_seconds > 0
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key from everything that affects the response."""
+        data = "|".join(str(part) for part in parts).encode('utf-8')
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Open the cache database on first use."""
+        if self._conn is None:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            # Only ever used from the thread driving the topic generator's event loop
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            ''')
+        return self._conn
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Cache key from make_key
+        
+        Returns:
+            The cached response text, or None if missing or expired
+        """
+        if not self.enabled:
+            return None
+        
+        try:
+            row = self._connection().execute(
+                'SELECT response FROM responses WHERE key = ? AND created_at > ?',
+                (key, time.time() - self.ttl_seconds)
+            ).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error reading AI response cache: {e}")
+            return None
+    
+    def set(self, key: str, response: str):
+        """
+        Store a response and drop expired entries.
+        
+        Args:
+            key: Cache key from make_key
+            response: Raw response text
+        """
+        if not self.enabled:
+            return
+        
+        try:
+            now = time.time()
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)',
+                    (key, response, now)
+                )
+                conn.execute('DELETE FROM responses WHERE created_at <= ?', (now - self.ttl_seconds,))
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error writing AI response cache: {e}")
+    
+    def close(self):
+        """Close the cache database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -3,26 +3,199 @@ AI-powered topic generator for blog content.
 Uses Gemini API to generate relevant blog topics from email content.
 """
 
+import asyncio
+import hashlib
+import importlib.util
 import json
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-
-import google.generativeai as genai
-from openai import OpenAI
+import random
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import List, Dict, Any, DefaultDict, Iterator, Optional, Union
+from datetime import datetime, timezone
 
+from src.ai.llm_cache import ResponseCache
 from src.config.config_manager import get_config
 from src.utils.logger import get_logger
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # optional, faster JSON parsing
+    _json_loads = json.loads
+
+try:
+    import json_repair
+except ImportError:  # optional, recovers slightly malformed JSON
+    json_repair = None
+
+
+# Fields copied from each email into a topic's source_emails, with defaults
+SOURCE_EMAIL_FIELDS = (
+    ('subject', ''),
+    ('from', ''),
+    ('date', ''),
+    ('category', ''),
+    ('relevance_score', 0.0),
+    ('quality_score', 0.0)
+)
+_SOURCE_EMAIL_KEYS = tuple(field for field, _ in SOURCE_EMAIL_FIELDS)
+
+
+def source_email_rows(source_emails: Union[List[Dict[str, Any]], Dict[str, List[Any]]]) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over a topic's source emails as one dict per email.
+    
+    Args:
+        source_emails: Source emails as a list of dicts, or in columnar form
+            (one list per field, see AIConfig.columnar_sources)
+    
+    Returns:
+        Iterator of per-email dicts
+    """
+    if isinstance(source_emails, dict):
+        keys = list(source_emails)
+        return (dict(zip(keys, row)) for row in zip(*source_emails.values()))
+    return iter(source_emails)
+
+
+def source_email_count(source_emails: Union[List[Dict[str, Any]], Dict[str, List[Any]]]) -> int:
+    """Number of emails in a topic's source emails, in either layout."""
+    if isinstance(source_emails, dict):
+        return len(next(iter(source_emails.values()), []))
+    return len(source_emails)
+
+
+@lru_cache(maxsize=None)
+def _get_embedding_model(model_name: str):
+    """Load a sentence-transformers model once, or None if it is unavailable."""
+    try:
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _get_token_encoder():
+    """Load the tiktoken encoder once, or None if tiktoken (or its data) is unavailable."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+# JSON object inside a ``` / ```json fence, or else the outermost {...} in the text
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```|(\{.*\})', re.DOTALL)
+
+# Prompt templates, formatted per request ({{ }} are literal JSON braces)
+_TOPIC_PROMPT_TEMPLATE = """
+        Based on the following email content from the {category} category, generate 3-5 relevant blog topics.
+        
+        Email Content:
+        {content_summary}
+        
+        Please generate topics that are:
+        1. Relevant to the content provided
+        2. Engaging and interesting for readers
+        3. Specific and actionable
+        4. Suitable for a tech/professional blog
+        
+        For each topic, provide:
+        - Title: A catchy, SEO-friendly title
+        - Description: A brief description of what the post would cover
+        - Keywords: 3-5 relevant keywords
+        - Difficulty: Beginner, Intermediate, or Advanced
+        
+        Format your response as JSON:
+        {{
+            "topics": [
+                {{
+                    "title": "Topic Title",
+                    "description": "Topic description",
+                    "keywords": ["keyword1", "keyword2", "keyword3"],
+                    "difficulty": "Beginner|Intermediate|Advanced",
+                    "category": "{category}"
+                }}
+            ]
+        }}
+        
+        Only return valid JSON, no additional text.
+        """
+
+_MULTI_CATEGORY_PROMPT_TEMPLATE = """
+        The following email content is grouped into categories, each section starting with "### CATEGORY: <name>".
+        For each category, generate 3-5 relevant blog topics based only on that category's emails.
+        
+        Email Content:
+        {sections}
+        
+        Please generate topics that are:
+        1. Relevant to the content provided
+        2. Engaging and interesting for readers
+        3. Specific and actionable
+        4. Suitable for a tech/professional blog
+        
+        For each topic, provide:
+        - Title: A catchy, SEO-friendly title
+        - Description: A brief description of what the post would cover
+        - Keywords: 3-5 relevant keywords
+        - Difficulty: Beginner, Intermediate, or Advanced
+        - Category: The exact category name the topic was generated for
+        
+        Format your response as JSON:
+        {{
+            "topics": [
+                {{
+                    "title": "Topic Title",
+                    "description": "Topic description",
+                    "keywords": ["keyword1", "keyword2", "keyword3"],
+                    "difficulty": "Beginner|Intermediate|Advanced",
+                    "category": "Category name"
+                }}
+            ]
+        }}
+        
+        Only return valid JSON, no additional text.
+        """
+
 
 class TopicGenerator:
     """Generate blog topics from email content using AI."""
     
+    # Share of ai.max_tokens spent on the email content of one category,
+    # split between emails by quality score
+    SUMMARY_BUDGET_RATIO = 0.6
+    MIN_EMAIL_TOKENS = 16
+    # Characters of content compared when looking for duplicate emails
+    DEDUP_CONTENT_CHARS = 500
+    # Retry policy for transient provider errors (rate limits, timeouts, 5xx)
+    MAX_ATTEMPTS = 3
+    RETRY_MIN_DELAY = 1.0
+    RETRY_MAX_DELAY = 8.0
+    
     def __init__(self):
         self.config = get_config()
         self.logger = get_logger("topic_generator")
+        # Provider SDKs are imported only for the configured provider
+        self._genai = None
+        self._gemini_json_mode = False
+        # GenerationConfig objects keyed by (temperature, max_tokens), built once each
+        self._gemini_generation_configs = {}
         self.gemini_model = None
         self.openai_client = None
+        self.async_openai_client = None
+        # Provider exceptions worth retrying, filled in by _setup_ai_providers
+        self._transient_errors = ()
+        # Pooled HTTP clients shared by all OpenAI requests
+        self._http_client = None
+        self._async_http_client = None
+        # Async clients stay bound to the loop they first ran on, so every
+        # generate_topics call reuses this one
+        self._loop = None
+        self.response_cache = ResponseCache(self.config.ai.cache_dir, self.config.ai.cache_ttl_s)
         
         # Initialize AI providers
         self._setup_ai_providers()
@@ -32,21 +205,69 @@ class TopicGenerator:
         try:
             if self.config.ai.provider == "gemini":
                 if self.config.ai.gemini_api_key:
+                    import google.generativeai as genai
+                    self._genai = genai
                     genai.configure(api_key=self.config.ai.gemini_api_key)
                     self.gemini_model = genai.GenerativeModel(self.config.ai.model)
+                    self._gemini_json_mode = self._supports_gemini_json_mode(genai)
+                    try:
+                        from google.api_core import exceptions as google_exceptions
+                        self._transient_errors = (
+                            google_exceptions.ResourceExhausted,
+                            google_exceptions.ServiceUnavailable,
+                            google_exceptions.DeadlineExceeded,
+                            google_exceptions.InternalServerError
+                        )
+                    except ImportError:
+                        pass
                     self.logger.info("Gemini AI provider initialized")
                 else:
                     self.logger.warning("Gemini API key not configured")
                     
             elif self.config.ai.provider == "openai":
                 if self.config.ai.openai_api_key:
-                    self.openai_client = OpenAI(api_key=self.config.ai.openai_api_key)
+                    import httpx
+                    import openai
+                    from openai import AsyncOpenAI, OpenAI
+                    
+                    # Reuse connections (and HTTP/2 multiplexing when h2 is
+                    # installed) across requests instead of re-handshaking
+                    limits = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+                    http2 = importlib.util.find_spec("h2") is not None
+                    self._http_client = httpx.Client(http2=http2, limits=limits)
+                    self._async_http_client = httpx.AsyncClient(http2=http2, limits=limits)
+                    
+                    self.openai_client = OpenAI(
+                        api_key=self.config.ai.openai_api_key,
+                        http_client=self._http_client
+                    )
+                    self.async_openai_client = AsyncOpenAI(
+                        api_key=self.config.ai.openai_api_key,
+                        http_client=self._async_http_client
+                    )
+                    self._transient_errors = (
+                        openai.RateLimitError,
+                        openai.APIConnectionError,
+                        openai.APITimeoutError,
+                        openai.InternalServerError
+                    )
                     self.logger.info("OpenAI provider initialized")
                 else:
                     self.logger.warning("OpenAI API key not configured")
                     
+        except ImportError as e:
+            self.logger.error("SDK for AI provider %s is not installed: %s", self.config.ai.provider, e)
         except Exception as e:
-            self.logger.error(f"Error setting up AI providers: {e}")
+            self.logger.error("Error setting up AI providers: %s", e)
+    
+    @staticmethod
+    def _supports_gemini_json_mode(genai) -> bool:
+        """Check whether the installed Gemini SDK supports JSON response mode."""
+        try:
+            genai.types.GenerationConfig(response_mime_type="application/json")
+            return True
+        except TypeError:
+            return False
     
     def generate_topics(self, processed_emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -63,236 +284,428 @@ class TopicGenerator:
             return []
         
         try:
-            self.logger.info(f"Generating topics from {len(processed_emails)} emails")
+            self.logger.info("Generating topics from %d emails", len(processed_emails))
             
             # Group emails by category for better topic generation
             categorized_emails = self._categorize_emails(processed_emails)
             
-            topics = []
-            for category, emails in categorized_emails.items():
-                if emails:
-                    category_topics = self._generate_category_topics(category, emails)
-                    topics.extend(category_topics)
+            # Request topics for every category concurrently
+            topics = self._get_loop().run_until_complete(self._agenerate_all_topics(categorized_emails))
             
             # Limit topics based on configuration
             max_topics = self.config.ai.max_topics_per_scan
             if len(topics) > max_topics:
                 topics = topics[:max_topics]
-                self.logger.info(f"Limited topics to {max_topics} as per configuration")
+                self.logger.info("Limited topics to %s as per configuration", max_topics)
             
-            self.logger.info(f"Generated {len(topics)} topics")
+            self.logger.info("Generated %d topics", len(topics))
             return topics
             
         except Exception as e:
-            self.logger.error(f"Error generating topics: {e}")
+            self.logger.error("Error generating topics: %s", e)
             return []
     
+    def close(self):
+        """Release pooled HTTP connections, the event loop and the response cache."""
+        try:
+            if self._async_http_client is not None:
+                self._get_loop().run_until_complete(self._async_http_client.aclose())
+                self._async_http_client = None
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+        except Exception as e:
+            self.logger.warning("Error closing AI provider connections: %s", e)
+        
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
+        self.response_cache.close()
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the event loop that drives this generator's async requests."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+    
     def _categorize_emails(self, emails: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """Group emails by their category."""
-        categorized = {}
+        categorized: DefaultDict[str, List[Dict[str, Any]]] = defaultdict(list)
         
         for email in emails:
-            category = email.get('category', 'other')
-            if category not in categorized:
-                categorized[category] = []
-            categorized[category].append(email)
+            categorized[email.get('category', 'other')].append(email)
         
-        return categorized
+        return dict(categorized)
     
-    def _generate_category_topics(self, category: str, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Generate topics for a specific category of emails."""
+    async def _agenerate_all_topics(self, categorized_emails: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Generate topics for all categories.
+        
+        All categories go into a single request when the combined prompt is
+        small enough; otherwise each category gets its own request, running
+        at most max_concurrent_tasks at once.
+        """
+        summaries = {}
+        for category, emails in categorized_emails.items():
+            if emails:
+                content_summary = self._prepare_content_summary(emails)
+                if content_summary:
+                    summaries[category] = content_summary
+        
+        if not summaries:
+            return []
+        
+        # Rough token estimate of ~4 characters per token
+        estimated_tokens = sum(len(content_summary) for content_summary in summaries.values()) // 4
+        if len(summaries) > 1 and estimated_tokens <= self.config.ai.max_tokens * 3:
+            return await self._agenerate_multi_category_topics(categorized_emails, summaries)
+        
+        semaphore = asyncio.Semaphore(self.config.ai.max_concurrent_tasks)
+        
+        async def bounded(category: str, content_summary: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._agenerate_category_topics(category, categorized_emails[category], content_summary)
+        
+        results = await asyncio.gather(
+            *(bounded(category, content_summary) for category, content_summary in summaries.items()),
+            return_exceptions=True
+        )
+        
+        topics = []
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error("Error generating category topics: %s", result)
+                continue
+            topics.extend(result)
+        return topics
+    
+    async def _agenerate_multi_category_topics(self, categorized_emails: Dict[str, List[Dict[str, Any]]],
+                                               summaries: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Generate topics for several categories with a single AI request."""
         try:
-            # Prepare content for AI analysis
-            content_summary = self._prepare_content_summary(emails)
+            prompt = self._create_multi_category_prompt(summaries)
+            # Leave the same output budget as one request per category would get
+            topics = await self._agenerate(prompt, self.config.ai.max_tokens * len(summaries))
             
-            if not content_summary:
-                return []
+            # Attach the source emails of the category each topic was generated for
+            categories = {category.lower(): category for category in summaries}
+            source_emails = {}
+            for topic in topics:
+                category = categories.get(str(topic.get('category', '')).lower())
+                if category is None:
+                    topic['source_emails'] = []
+                    continue
+                topic['category'] = category
+                if category not in source_emails:
+                    source_emails[category] = self._source_emails(categorized_emails[category])
+                topic['source_emails'] = source_emails[category]
+            
+            return topics
             
+        except Exception as e:
+            self.logger.error("Error generating topics for categories %s: %s", ', '.join(summaries), e)
+            return []
+    
+    async def _agenerate_category_topics(self, category: str, emails: List[Dict[str, Any]],
+                                         content_summary: str) -> List[Dict[str, Any]]:
+        """Generate topics for a specific category of emails."""
+        try:
             # Generate topics using AI
-            if self.config.ai.provider == "gemini":
-                topics = self._generate_with_gemini(category, content_summary)
-            elif self.config.ai.provider == "openai":
-                topics = self._generate_with_openai(category, content_summary)
-            else:
-                self.logger.warning(f"Unknown AI provider: {self.config.ai.provider}")
-                return []
+            prompt = self._create_topic_prompt(category, content_summary)
+            topics = await self._agenerate(prompt, self.config.ai.max_tokens)
             
-            # Add source email information to each topic
+            # Add source email information to each topic; every topic shares
+            # the same (read-only) list
+            source_emails = self._source_emails(emails)
             for topic in topics:
-                topic['source_emails'] = [
-                    {
-                        'subject': email.get('subject', ''),
-                        'from': email.get('from', ''),
-                        'date': email.get('date', ''),
-                        'category': email.get('category', ''),
-                        'relevance_score': email.get('relevance_score', 0.0),
-                        'quality_score': email.get('quality_score', 0.0)
-                    }
-                    for email in emails
-                ]
+                topic['source_emails'] = source_emails
             
             return topics
                 
         except Exception as e:
-            self.logger.error(f"Error generating topics for category {category}: {e}")
+            self.logger.error("Error generating topics for category %s: %s", category, e)
             return []
     
+    def _source_emails(self, emails: List[Dict[str, Any]]) -> Union[List[Dict[str, Any]], Dict[str, List[Any]]]:
+        """Build the source email information attached to generated topics."""
+        # The emails belong to the caller, so missing fields are defaulted
+        # here rather than filled in on them
+        values = [tuple(email.get(field, default) for field, default in SOURCE_EMAIL_FIELDS) for email in emails]
+        
+        if self.config.ai.columnar_sources:
+            # One list per field avoids a dict per email; read with source_email_rows
+            columns = zip(*values) if values else ((),) * len(_SOURCE_EMAIL_KEYS)
+            return {key: list(column) for key, column in zip(_SOURCE_EMAIL_KEYS, columns)}
+        
+        return [dict(zip(_SOURCE_EMAIL_KEYS, row)) for row in values]
+    
+    async def _agenerate(self, prompt: str, max_tokens: int) -> List[Dict[str, Any]]:
+        """Send a prompt to the configured AI provider (or the response cache) and parse the topics."""
+        provider = self.config.ai.provider
+        if provider == "gemini":
+            generate = self._agenerate_with_gemini
+        elif provider == "openai":
+            generate = self._agenerate_with_openai
+        else:
+            self.logger.warning("Unknown AI provider: %s", provider)
+            return []
+        
+        cache_key = self.response_cache.make_key(
+            provider, self.config.ai.model, self.config.ai.temperature, max_tokens, prompt
+        )
+        response_text = self.response_cache.get(cache_key)
+        if response_text is not None:
+            self.logger.info("Using cached AI response")
+            return self._parse_topics(response_text, provider)
+        
+        response_text = await generate(prompt, max_tokens)
+        if not response_text:
+            return []
+        
+        topics = self._parse_topics(response_text, provider)
+        # Only cache responses that produced topics, so bad output is retried
+        if topics:
+            self.response_cache.set(cache_key, response_text)
+        return topics
+    
     def _prepare_content_summary(self, emails: List[Dict[str, Any]]) -> str:
         """Prepare a summary of email content for AI analysis."""
-        try:
-            summary_parts = []
-            
-            for email in emails:
-                subject = email.get('subject', '')
-                content = email.get('content', '')
-                sender = email.get('from', '')
-                
-                # Truncate content to reasonable length
-                if len(content) > 500:
-                    content = content[:500] + "..."
-                
-                summary_parts.append(f"From: {sender}")
-                summary_parts.append(f"Subject: {subject}")
-                summary_parts.append(f"Content: {content}")
-                summary_parts.append("---")
-            
-            return "\n".join(summary_parts)
+        if self.config.ai.dedup_emails:
+            emails = self._dedupe_emails(emails)
+        
+        # Higher quality emails get a larger share of the token budget
+        total_budget: int = int(self.config.ai.max_tokens * self.SUMMARY_BUDGET_RATIO)
+        weights: List[float] = [max(float(email.get('quality_score', 1.0) or 0.0), 0.0) for email in emails]
+        weight_sum: float = sum(weights)
+        if weight_sum == 0:
+            weights = [1.0] * len(emails)
+            weight_sum = float(len(emails))
+        
+        summary_parts: List[str] = []
+        
+        for email, weight in zip(emails, weights):
+            budget = max(self.MIN_EMAIL_TOKENS, int(total_budget * weight / weight_sum))
+            summary_parts.append(
+                f"From: {email.get('from', '')}\n"
+                f"Subject: {email.get('subject', '')}\n"
+                f"Content: {self._trimmed_content(email, budget)}\n"
+                "---"
+            )
+        
+        return "\n".join(summary_parts)
+    
+    def _dedupe_emails(self, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop near-duplicate emails, keeping the highest quality one of each group.
+        
+        Emails are compared by the cosine similarity of sentence embeddings of
+        their subject and opening content. Without sentence-transformers only
+        exact duplicates of that text are dropped.
+        
+        Args:
+            emails: Emails in one category
+        
+        Returns:
+            The remaining emails, in their original order
+        """
+        if len(emails) < 2:
+            return emails
+        
+        texts = [
+            f"{email.get('subject', '')}\n{email.get('content', '')[:self.DEDUP_CONTENT_CHARS]}"
+            for email in emails
+        ]
+        # Best emails first, so each duplicate group keeps its highest quality member
+        order = sorted(
+            range(len(emails)),
+            key=lambda i: float(emails[i].get('quality_score', 0.0) or 0.0),
+            reverse=True
+        )
+        
+        model = _get_embedding_model(self.config.ai.embedding_model)
+        keep = set()
+        if model is None:
+            seen = set()
+            for i in order:
+                digest = hashlib.blake2b(texts[i].lower().encode('utf-8'), digest_size=16).digest()
+                if digest not in seen:
+                    seen.add(digest)
+                    keep.add(i)
+        else:
+            import numpy as np
             
-        except Exception as e:
-            self.logger.error(f"Error preparing content summary: {e}")
-            return ""
+            # Kept local rather than cached on the caller's email dicts
+            vectors = np.asarray(model.encode(texts, normalize_embeddings=True))
+            similarity = vectors @ vectors.T
+            threshold = self.config.ai.dedup_threshold
+            for i in order:
+                if not any(similarity[i, j] >= threshold for j in keep):
+                    keep.add(i)
+        
+        if len(keep) < len(emails):
+            self.logger.info("Skipping %d near-duplicate emails", len(emails) - len(keep))
+        return [email for i, email in enumerate(emails) if i in keep]
+    
+    def _trimmed_content(self, email: Dict[str, Any], budget: int) -> str:
+        """
+        Get email content truncated to a token budget.
+        
+        Tokens are counted with tiktoken when available, otherwise estimated
+        at ~4 characters per token.
+        """
+        content = email.get('content', '')
+        encoder = _get_token_encoder()
+        if encoder is None:
+            limit = budget * 4
+            trimmed = content[:limit] + "..." if len(content) > limit else content
+        else:
+            # Tokens are rarely longer than 8 characters, so there is no need
+            # to encode the rest of a long body
+            head = content[:budget * 8]
+            tokens = encoder.encode(head, disallowed_special=())
+            if len(tokens) <= budget and len(head) == len(content):
+                trimmed = content
+            else:
+                trimmed = encoder.decode(tokens[:budget]) + "..."
+        
+        return trimmed
     
-    def _generate_with_gemini(self, category: str, content_summary: str) -> List[Dict[str, Any]]:
-        """Generate topics using Gemini API."""
+    async def _agenerate_with_gemini(self, prompt: str, max_tokens: int) -> Optional[str]:
+        """Generate topics using Gemini API, returning the raw response text."""
         try:
             if not self.gemini_model:
                 self.logger.error("Gemini model not initialized")
-                return []
-            
-            prompt = self._create_topic_prompt(category, content_summary)
+                return None
             
-            response = self.gemini_model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=self.config.ai.temperature,
-                    max_output_tokens=self.config.ai.max_tokens
+            generation_config = self._gemini_generation_config(max_tokens)
+            response = await self._acall_with_retry(
+                lambda: self.gemini_model.generate_content_async(
+                    prompt,
+                    generation_config=generation_config
                 )
             )
             
-            return self._parse_gemini_response(response.text)
+            return response.text
             
         except Exception as e:
-            self.logger.error(f"Error generating topics with Gemini: {e}")
-            return []
+            self.logger.error("Error generating topics with Gemini: %s", e)
+            return None
     
-    def _generate_with_openai(self, category: str, content_summary: str) -> List[Dict[str, Any]]:
-        """Generate topics using OpenAI API."""
+    def _gemini_generation_config(self, max_tokens: int):
+        """Get the Gemini GenerationConfig for a request, building it on first use."""
+        # Keyed on the temperature as well, so config changes take effect
+        key = (self.config.ai.temperature, max_tokens)
+        generation_config = self._gemini_generation_configs.get(key)
+        if generation_config is None:
+            options = {
+                'temperature': self.config.ai.temperature,
+                'max_output_tokens': max_tokens
+            }
+            if self._gemini_json_mode:
+                # Constrain the model to emit a bare JSON document
+                options['response_mime_type'] = "application/json"
+            generation_config = self._genai.types.GenerationConfig(**options)
+            self._gemini_generation_configs[key] = generation_config
+        return generation_config
+    
+    async def _agenerate_with_openai(self, prompt: str, max_tokens: int) -> Optional[str]:
+        """Generate topics using OpenAI API, returning the raw response text."""
         try:
-            if not self.openai_client:
+            if not self.async_openai_client:
                 self.logger.error("OpenAI client not initialized")
-                return []
+                return None
             
-            prompt = self._create_topic_prompt(category, content_summary)
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that generates blog topics from email content."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.config.ai.max_tokens,
-                temperature=self.config.ai.temperature
+            response = await self._acall_with_retry(
+                lambda: self.async_openai_client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": "You are a helpful assistant that generates blog topics from email content."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=max_tokens,
+                    temperature=self.config.ai.temperature,
+                    # JSON mode guarantees a parseable JSON object
+                    response_format={"type": "json_object"}
+                )
             )
             
-            return self._parse_openai_response(response.choices[0].message.content)
+            return response.choices[0].message.content
             
         except Exception as e:
-            self.logger.error(f"Error generating topics with OpenAI: {e}")
-            return []
+            self.logger.error("Error generating topics with OpenAI: %s", e)
+            return None
     
-    def _create_topic_prompt(self, category: str, content_summary: str) -> str:
-        """Create a prompt for topic generation."""
-        return f"""
-        Based on the following email content from the {category} category, generate 3-5 relevant blog topics.
-        
-        Email Content:
-        {content_summary}
-        
-        Please generate topics that are:
-        1. Relevant to the content provided
-        2. Engaging and interesting for readers
-        3. Specific and actionable
-        4. Suitable for a tech/professional blog
-        
-        For each topic, provide:
-        - Title: A catchy, SEO-friendly title
-        - Description: A brief description of what the post would cover
-        - Keywords: 3-5 relevant keywords
-        - Difficulty: Beginner, Intermediate, or Advanced
+    async def _acall_with_retry(self, make_request):
+        """
+        Await a provider request, retrying transient errors with backoff.
         
-        Format your response as JSON:
-        {{
-            "topics": [
-                {{
-                    "title": "Topic Title",
-                    "description": "Topic description",
-                    "keywords": ["keyword1", "keyword2", "keyword3"],
-                    "difficulty": "Beginner|Intermediate|Advanced",
-                    "category": "{category}"
-                }}
-            ]
-        }}
+        Args:
+            make_request: Zero-argument callable returning a new request awaitable
         
-        Only return valid JSON, no additional text.
+        Returns:
+            The provider response
         """
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            try:
+                return await make_request()
+            except self._transient_errors as e:
+                if attempt == self.MAX_ATTEMPTS:
+                    raise
+                # Exponential backoff with random jitter so concurrent requests spread out
+                delay = random.uniform(
+                    self.RETRY_MIN_DELAY,
+                    min(self.RETRY_MAX_DELAY, self.RETRY_MIN_DELAY * 2 ** attempt)
+                )
+                self.logger.warning(
+                    "Transient AI provider error (attempt %d/%d), retrying in %.1fs: %s",
+                    attempt, self.MAX_ATTEMPTS, delay, e
+                )
+                await asyncio.sleep(delay)
     
-    def _parse_gemini_response(self, response_text: str) -> List[Dict[str, Any]]:
-        """Parse Gemini API response into structured topics."""
-        try:
-            # Clean the response text
-            response_text = response_text.strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            response_data = json.loads(response_text)
-            topics = response_data.get('topics', [])
-            
-            # Add metadata
-            for topic in topics:
-                topic['generated_at'] = datetime.now().isoformat()
-                topic['ai_provider'] = 'gemini'
-            
-            return topics
-            
-        except Exception as e:
-            self.logger.error(f"Error parsing Gemini response: {e}")
-            return []
+    def _create_topic_prompt(self, category: str, content_summary: str) -> str:
+        """Create a prompt for topic generation."""
+        return _TOPIC_PROMPT_TEMPLATE.format(category=category, content_summary=content_summary)
+    
+    def _create_multi_category_prompt(self, summaries: Dict[str, str]) -> str:
+        """Create a prompt that asks for topics for several categories at once."""
+        sections = "\n".join(
+            f"### CATEGORY: {category}\n{content_summary}"
+            for category, content_summary in summaries.items()
+        )
+        return _MULTI_CATEGORY_PROMPT_TEMPLATE.format(sections=sections)
     
-    def _parse_openai_response(self, response_text: str) -> List[Dict[str, Any]]:
-        """Parse OpenAI API response into structured topics."""
+    def _parse_topics(self, response_text: str, provider: str) -> List[Dict[str, Any]]:
+        """Parse an AI response into structured topics."""
+        # JSON mode responses are a bare JSON document; otherwise look for
+        # the JSON inside the text
+        candidate = response_text.strip()
+        if not candidate.startswith('{'):
+            match = _JSON_FENCE_RE.search(response_text)
+            if not match:
+                self.logger.error("No JSON found in %s response", provider)
+                return []
+            candidate = match.group(1) or match.group(2)
         try:
-            # Clean the response text
-            response_text = response_text.strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            response_data = json.loads(response_text)
-            topics = response_data.get('topics', [])
-            
-            # Add metadata
-            for topic in topics:
-                topic['generated_at'] = datetime.now().isoformat()
-                topic['ai_provider'] = 'openai'
-            
-            return topics
-            
-        except Exception as e:
-            self.logger.error(f"Error parsing OpenAI response: {e}")
+            response_data = _json_loads(candidate)
+        except ValueError as e:
+            if json_repair is None:
+                self.logger.error("Error parsing %s response: %s", provider, e)
+                return []
+            response_data = json_repair.loads(candidate)
+        
+        topics = response_data.get('topics') if isinstance(response_data, dict) else None
+        if not isinstance(topics, list):
+            self.logger.error("No topics list in %s response", provider)
             return []
+        topics = [topic for topic in topics if isinstance(topic, dict)]
+        
+        # Add metadata (one UTC timestamp for the whole response)
+        generated_at = datetime.now(timezone.utc).isoformat()
+        for topic in topics:
+            topic['generated_at'] = generated_at
+            topic['ai_provider'] = provider
+        
+        return topics
     
     def test_connection(self) -> bool:
         """Test the AI provider connection."""
@@ -320,9 +733,9 @@ class TopicGenerator:
                 return response.choices[0].message.content is not None
                 
             else:
-                self.logger.error(f"Unknown AI provider: {self.config.ai.provider}")
+                self.logger.error("Unknown AI provider: %s", self.config.ai.provider)
                 return False
                 
         except Exception as e:
-            self.logger.error(f"AI connection test failed: {e}")
+            self.logger.error("AI connection test failed: %s", e)
             return False 
\ No newline at end of file
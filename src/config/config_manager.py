@@ -3,45 +3,187 @@ Configuration manager for the Email Scanner system.
 Handles loading and validating configuration from YAML files.
 """
 
+import json
+import operator
 import os
-import yaml
+import sys
+import threading
+from dataclasses import dataclass, field, fields as dataclass_fields
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+from typing import Callable, ClassVar, Dict, Any, FrozenSet, List, Optional, Set, Tuple
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:  # optional, faster JSON parsing
+    _json_loads = json.loads
+    
+    def _json_dumps(data: Any) -> bytes:
+        return json.dumps(data).encode('utf-8')
 
-class EmailConfig:
+# Environment variables that override config values, with their (section, key)
+_ENV_MAPPINGS: Tuple[Tuple[str, str, str], ...] = (
+    ('EMAIL_USERNAME', 'email', 'username'),
+    ('EMAIL_PASSWORD', 'email', 'password'),
+    ('EMAIL_IMAP_SERVER', 'email', 'imap_server'),
+    ('EMAIL_IMAP_PORT', 'email', 'imap_port'),
+    ('EMAIL_SMTP_SERVER', 'email', 'smtp_server'),
+    ('EMAIL_SMTP_PORT', 'email', 'smtp_port'),
+    ('EMAIL_USE_GMAIL_API', 'email', 'use_gmail_api'),
+    ('EMAIL_CREDENTIALS_FILE', 'email', 'credentials_file'),
+    ('EMAIL_TOKEN_FILE', 'email', 'token_file'),
+    ('GEMINI_API_KEY', 'ai', 'gemini_api_key'),
+    ('OPENAI_API_KEY', 'ai', 'openai_api_key'),
+    ('DATABASE_URL', 'database', 'url'),
+    ('SLACK_WEBHOOK_URL', 'notifications', 'slack_webhook'),
+    ('DISCORD_WEBHOOK_URL', 'notifications', 'discord_webhook'),
+    ('WEB_SECRET_KEY', 'web', 'secret_key'),
+    ('NOTIFICATION_EMAIL', 'notifications', 'notification_email'),
+)
+
+_ENV_VARS = frozenset(env_var for env_var, _, _ in _ENV_MAPPINGS)
+
+# Config values converted to integers when set from the environment
+_INT_KEYS = frozenset({'imap_port', 'smtp_port'})
+
+# PyYAML and python-dotenv are imported on first use, so importing this module
+# (e.g. for the config classes) stays cheap
+@lru_cache(maxsize=1)
+def _yaml_codecs() -> Tuple[Any, Any]:
+    """Prefer the libyaml-backed loader/dumper, falling back to pure Python."""
+    try:
+        from yaml import CSafeLoader as loader, CSafeDumper as dumper
+    except ImportError:
+        from yaml import SafeLoader as loader, SafeDumper as dumper
+    return loader, dumper
+
+
+def _yaml_load(data: bytes) -> Any:
+    """Parse YAML with the fastest available safe loader."""
+    import yaml
+    return yaml.load(data, Loader=_yaml_codecs()[0])
+
+
+def _yaml_dump(data: Any) -> str:
+    """Render YAML with the fastest available safe dumper."""
+    import yaml
+    return yaml.dump(data, Dumper=_yaml_codecs()[1], default_flow_style=False, indent=2)
+
+
+@lru_cache(maxsize=1)
+def _load_dotenv_once() -> bool:
+    """Load environment variables from the .env file, only on the first call."""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return True
+
+
+# Settings drawn from a small vocabulary, interned so that instances share the
+# string objects and comparisons against them can short-circuit on identity
+_INTERNED_SETTINGS = (
+    ('email', 'provider'),
+    ('email', 'gmail_labels'),
+    ('email', 'include_categories'),
+    ('ai', 'provider'),
+    ('ai', 'model'),
+    ('ai', 'categories'),
+    ('logging', 'level'),
+)
+
+
+def _intern_settings(config_data: Dict[str, Any]) -> None:
+    """Intern the string values (or list items) of the settings in _INTERNED_SETTINGS."""
+    for section, key in _INTERNED_SETTINGS:
+        values = config_data.get(section)
+        if not isinstance(values, dict) or key not in values:
+            continue
+        value = values[key]
+        if isinstance(value, str):
+            values[key] = sys.intern(value)
+        elif isinstance(value, list):
+            values[key] = [sys.intern(item) if isinstance(item, str) else item for item in value]
+
+
+def _present_env_vars() -> Set[str]:
+    """Override environment variables that are currently set."""
+    return _ENV_VARS & os.environ.keys()
+
+
+# Parsed configs keyed by (path, mtime, size, env overrides), shared by all managers
+_CONFIG_CACHE: Dict[Tuple[Any, ...], 'AppConfig'] = {}
+
+
+@lru_cache(maxsize=None)
+def _config_fields(config_cls: type) -> FrozenSet[str]:
+    """Names of the settings a config section accepts, computed once per class."""
+    return frozenset(f.name for f in dataclass_fields(config_cls))
+
+
+@lru_cache(maxsize=None)
+def _config_getter(config_cls: type) -> Tuple[Tuple[str, ...], Callable[[Any], Tuple[Any, ...]]]:
+    """Field names of a config section, in order, and a C-level getter for their values."""
+    names = tuple(f.name for f in dataclass_fields(config_cls))
+    return names, operator.attrgetter(*names)
+
+
+class _ConfigSection:
+    """Shared dict conversion for the dataclass config sections (all have several fields)."""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for YAML serialization."""
+        names, getter = _config_getter(type(self))
+        return dict(zip(names, getter(self)))
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """Create from dictionary, ignoring unknown keys."""
+        config = cls()
+        fields = _config_fields(cls)
+        for key, value in data.items():
+            if key in fields:
+                setattr(config, key, value)
+        return config
+
+
+@dataclass
+class EmailConfig(_ConfigSection):
     """Gmail-specific email configuration settings."""
     
-    def __init__(self):
-        self.provider = "gmail"
-        self.username = ""
-        self.password = ""  # Gmail App Password (not regular password)
-        self.imap_server = "imap.gmail.com"
-        self.imap_port = 993
-        self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
-        self.use_ssl = True
-        self.use_oauth2 = False  # Set to False for App Password authentication
-        
-        # Gmail API settings
-        self.use_gmail_api = True  # Use Gmail API instead of SMTP/IMAP
-        self.credentials_file = "credentials.json"  # Path to Google API credentials
-        self.token_file = "token.json"  # Path to store OAuth2 token
-        
-        # Gmail-specific settings
-        self.gmail_labels = ["INBOX", "Primary", "Social", "Promotions"]
-        self.max_emails_per_scan = 100
-        self.scan_unread_only = False
-        self.days_back = 7
-        
-        # Filtering rules
-        self.exclude_domains = []
-        self.exclude_keywords = []
-        self.include_categories = ["tech", "newsletter", "social", "professional"]
-        
-        # Gmail API setup instructions
-        self.gmail_api_instructions = """
+    provider: str = "gmail"
+    username: str = ""
+    password: str = ""  # Gmail App Password (not regular password)
+    imap_server: str = "imap.gmail.com"
+    imap_port: int = 993
+    smtp_server: str = "smtp.gmail.com"
+    smtp_port: int = 587
+    use_ssl: bool = True
+    use_oauth2: bool = False  # Set to False for App Password authentication
+    fetch_batch_size: int = 100  # Messages requested per IMAP FETCH command
+    imap_compression: bool = True  # Use COMPRESS=DEFLATE (RFC 4978) when the server offers it
+    incremental_fetch: bool = True  # Only fetch IMAP messages newer than the last successful scan
+    uid_state_file: str = "data/imap_state.json"  # Last fetched UID per account and folder
+    text_parts_only: bool = False  # Download only text parts; attachments described from BODYSTRUCTURE
+    
+    # Gmail API settings
+    use_gmail_api: bool = True  # Use Gmail API instead of SMTP/IMAP
+    credentials_file: str = "credentials.json"  # Path to Google API credentials
+    token_file: str = "token.json"  # Path to store OAuth2 token
+    
+    # Gmail-specific settings
+    gmail_labels: List[str] = field(default_factory=lambda: ["INBOX", "Primary", "Social", "Promotions"])
+    max_emails_per_scan: int = 100
+    scan_unread_only: bool = False
+    days_back: int = 7
+    
+    # Filtering rules
+    exclude_domains: List[str] = field(default_factory=list)
+    exclude_keywords: List[str] = field(default_factory=list)
+    include_categories: List[str] = field(default_factory=lambda: ["tech", "newsletter", "social", "professional"])
+    
+    # Gmail API setup instructions
+    GMAIL_API_INSTRUCTIONS: ClassVar[str] = """
         To use Gmail API with this scanner, you need to:
         1. Go to Google Cloud Console (https://console.cloud.google.com/)
         2. Create a new project or select existing one
@@ -55,298 +197,210 @@ class EmailConfig:
         6. Run the application - it will open browser for OAuth2 authorization
         """
     
-    def to_dict(self):
-        """Convert to dictionary for YAML serialization."""
-        return {
-            'provider': self.provider,
-            'username': self.username,
-            'password': self.password,
-            'imap_server': self.imap_server,
-            'imap_port': self.imap_port,
-            'smtp_server': self.smtp_server,
-            'smtp_port': self.smtp_port,
-            'use_ssl': self.use_ssl,
-            'use_oauth2': self.use_oauth2,
-            'use_gmail_api': self.use_gmail_api,
-            'credentials_file': self.credentials_file,
-            'token_file': self.token_file,
-            'gmail_labels': self.gmail_labels,
-            'max_emails_per_scan': self.max_emails_per_scan,
-            'scan_unread_only': self.scan_unread_only,
-            'days_back': self.days_back,
-            'exclude_domains': self.exclude_domains,
-            'exclude_keywords': self.exclude_keywords,
-            'include_categories': self.include_categories
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
-        """Create from dictionary."""
-        config = cls()
-        for key, value in data.items():
-            if hasattr(config, key):
-                setattr(config, key, value)
-        return config
+    def validate(self) -> None:
+        """
+        Check the settings required by the configured connection method.
+        
+        Raises:
+            ValueError: If a required setting is missing
+        """
+        if self.use_gmail_api:
+            # For Gmail API, we need credentials file
+            if not os.path.exists(self.credentials_file):
+                raise ValueError(f"Gmail API credentials file not found: {self.credentials_file}")
+        else:
+            # For SMTP/IMAP, we need username and password
+            if not self.username:
+                raise ValueError("Email username is required for SMTP/IMAP")
+            
+            if not self.password:
+                raise ValueError("Email password is required for SMTP/IMAP")
 
 
-class DatabaseConfig:
+@dataclass
+class DatabaseConfig(_ConfigSection):
     """Database configuration settings."""
     
-    def __init__(self):
-        self.type = "sqlite"
-        self.url = "sqlite:///data/emails.db"
-        self.echo = False
-        self.pool_size = 10
-        self.max_overflow = 20
-    
-    def to_dict(self):
-        return {
-            'type': self.type,
-            'url': self.url,
-            'echo': self.echo,
-            'pool_size': self.pool_size,
-            'max_overflow': self.max_overflow
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
-        config = cls()
-        for key, value in data.items():
-            if hasattr(config, key):
-                setattr(config, key, value)
-        return config
+    type: str = "sqlite"
+    url: str = "sqlite:///data/emails.db"
+    echo: bool = False
+    pool_size: int = 10
+    max_overflow: int = 20
+    checkpoint_interval: int = 30
 
 
-class AIConfig:
+@dataclass
+class AIConfig(_ConfigSection):
     """AI configuration settings."""
     
-    def __init__(self):
-        self.provider = "gemini"
-        self.gemini_api_key = ""
-        self.openai_api_key = ""
-        self.model = "gemini-2.0-flash-lite"
-        self.max_tokens = 1000
-        self.temperature = 0.7
+    provider: str = "gemini"
+    gemini_api_key: str = ""
+    openai_api_key: str = ""
+    model: str = "gemini-2.0-flash-lite"
+    max_tokens: int = 1000
+    temperature: float = 0.7
+    max_concurrent_tasks: int = 5
+    
+    # Cache of AI responses, so repeated prompts skip the API call
+    cache_dir: str = "data/cache"
+    cache_ttl_s: int = 7 * 24 * 3600
+    
+    # Store topic source emails as one list per field instead of one dict per email
+    columnar_sources: bool = False
+    
+    # Drop near-duplicate emails (e.g. digest variants) before prompting
+    dedup_emails: bool = True
+    dedup_threshold: float = 0.85
+    embedding_model: str = "all-MiniLM-L6-v2"
+    
+    # Topic generation settings
+    max_topics_per_scan: int = 10
+    min_content_length: int = 100
+    relevance_threshold: float = 0.7
+    categories: List[str] = field(default_factory=lambda: [
+        "Technology Trends",
+        "Programming & Development", 
+        "AI & Machine Learning",
+        "Startup & Business",
+        "Productivity & Tools"
+    ])
+    
+    def validate(self) -> None:
+        """
+        Check that the configured provider has an API key.
         
-        # Topic generation settings
-        self.max_topics_per_scan = 10
-        self.min_content_length = 100
-        self.relevance_threshold = 0.7
-        self.categories = [
-            "Technology Trends",
-            "Programming & Development", 
-            "AI & Machine Learning",
-            "Startup & Business",
-            "Productivity & Tools"
-        ]
-    
-    def to_dict(self):
-        return {
-            'provider': self.provider,
-            'gemini_api_key': self.gemini_api_key,
-            'openai_api_key': self.openai_api_key,
-            'model': self.model,
-            'max_tokens': self.max_tokens,
-            'temperature': self.temperature,
-            'max_topics_per_scan': self.max_topics_per_scan,
-            'min_content_length': self.min_content_length,
-            'relevance_threshold': self.relevance_threshold,
-            'categories': self.categories
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
-        config = cls()
-        for key, value in data.items():
-            if hasattr(config, key):
-                setattr(config, key, value)
-        return config
+        Raises:
+            ValueError: If the provider's API key is missing
+        """
+        if self.provider == "gemini" and not self.gemini_api_key:
+            raise ValueError("Gemini API key is required when using Gemini provider")
+        
+        if self.provider == "openai" and not self.openai_api_key:
+            raise ValueError("OpenAI API key is required when using OpenAI provider")
 
 
-class SchedulerConfig:
+@dataclass
+class SchedulerConfig(_ConfigSection):
     """Scheduler configuration settings."""
     
-    def __init__(self):
-        self.scan_times = ["09:00", "18:00"]
-        self.timezone = "UTC"
-        self.max_retries = 3
-        self.retry_delay = 300
-    
-    def to_dict(self):
-        return {
-            'scan_times': self.scan_times,
-            'timezone': self.timezone,
-            'max_retries': self.max_retries,
-            'retry_delay': self.retry_delay
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
-        config = cls()
-        for key, value in data.items():
-            if hasattr(config, key):
-                setattr(config, key, value)
-        return config
+    scan_times: List[str] = field(default_factory=lambda: ["09:00", "18:00"])
+    timezone: str = "UTC"
+    max_retries: int = 3
+    retry_delay: int = 300
 
 
-class NotificationConfig:
+@dataclass
+class NotificationConfig(_ConfigSection):
     """Notification configuration settings."""
     
-    def __init__(self):
-        self.enabled = True
-        self.email_notifications = True
-        self.notification_email = ""
-        self.slack_webhook = ""
-        self.discord_webhook = ""
-        
-        # Notification triggers
-        self.new_topics = True
-        self.errors = True
-        self.scan_complete = False
-        self.weekly_summary = True
-    
-    def to_dict(self):
-        return {
-            'enabled': self.enabled,
-            'email_notifications': self.email_notifications,
-            'notification_email': self.notification_email,
-            'slack_webhook': self.slack_webhook,
-            'discord_webhook': self.discord_webhook,
-            'new_topics': self.new_topics,
-            'errors': self.errors,
-            'scan_complete': self.scan_complete,
-            'weekly_summary': self.weekly_summary
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
-        config = cls()
-        for key, value in data.items():
-            if hasattr(config, key):
-                setattr(config, key, value)
-        return config
+    enabled: bool = True
+    email_notifications: bool = True
+    notification_email: str = ""
+    slack_webhook: str = ""
+    discord_webhook: str = ""
+    
+    # Notification triggers
+    new_topics: bool = True
+    errors: bool = True
+    scan_complete: bool = False
+    weekly_summary: bool = True
 
 
-class LoggingConfig:
+@dataclass
+class LoggingConfig(_ConfigSection):
     """Logging configuration settings."""
     
-    def __init__(self):
-        self.level = "INFO"
-        self.file = "logs/email_scanner.log"
-        self.max_size = "10MB"
-        self.backup_count = 5
-        self.format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    
-    def to_dict(self):
-        return {
-            'level': self.level,
-            'file': self.file,
-            'max_size': self.max_size,
-            'backup_count': self.backup_count,
-            'format': self.format
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
-        config = cls()
-        for key, value in data.items():
-            if hasattr(config, key):
-                setattr(config, key, value)
-        return config
+    level: str = "INFO"
+    file: str = "logs/email_scanner.log"
+    max_size: str = "10MB"
+    backup_count: int = 5
+    format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
 
-class ProcessingConfig:
+@dataclass
+class ProcessingConfig(_ConfigSection):
     """Content processing configuration settings."""
     
-    def __init__(self):
-        self.max_email_size = "10MB"
-        self.extract_links = True
-        self.extract_attachments = False
-        self.clean_html = True
-        self.remove_duplicates = True
-        
-        # Content cleaning
-        self.remove_html_tags = True
-        self.remove_urls = False
-        self.remove_emails = True
-        self.remove_phone_numbers = True
-        self.min_word_count = 10
-    
-    def to_dict(self):
-        return {
-            'max_email_size': self.max_email_size,
-            'extract_links': self.extract_links,
-            'extract_attachments': self.extract_attachments,
-            'clean_html': self.clean_html,
-            'remove_duplicates': self.remove_duplicates,
-            'remove_html_tags': self.remove_html_tags,
-            'remove_urls': self.remove_urls,
-            'remove_emails': self.remove_emails,
-            'remove_phone_numbers': self.remove_phone_numbers,
-            'min_word_count': self.min_word_count
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
-        config = cls()
-        for key, value in data.items():
-            if hasattr(config, key):
-                setattr(config, key, value)
-        return config
+    max_email_size: str = "10MB"
+    extract_links: bool = True
+    extract_attachments: bool = False
+    clean_html: bool = True
+    remove_duplicates: bool = True
+    
+    # Content cleaning
+    remove_html_tags: bool = True
+    remove_urls: bool = False
+    remove_emails: bool = True
+    remove_phone_numbers: bool = True
+    min_word_count: int = 10
 
 
-class WebConfig:
+@dataclass
+class WebConfig(_ConfigSection):
     """Web interface configuration settings."""
     
-    def __init__(self):
-        self.enabled = False
-        self.host = "0.0.0.0"
-        self.port = 5000
-        self.debug = False
-        self.secret_key = ""
-    
-    def to_dict(self):
-        return {
-            'enabled': self.enabled,
-            'host': self.host,
-            'port': self.port,
-            'debug': self.debug,
-            'secret_key': self.secret_key
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
-        config = cls()
-        for key, value in data.items():
-            if hasattr(config, key):
-                setattr(config, key, value)
-        return config
+    enabled: bool = False
+    host: str = "0.0.0.0"
+    port: int = 5000
+    debug: bool = False
+    secret_key: str = ""
 
 
 class AppConfig:
-    """Main application configuration."""
-    
-    def __init__(self):
-        self.email = EmailConfig()
-        self.database = DatabaseConfig()
-        self.ai = AIConfig()
-        self.scheduler = SchedulerConfig()
-        self.notifications = NotificationConfig()
-        self.logging = LoggingConfig()
-        self.processing = ProcessingConfig()
-        self.web = WebConfig()
-    
-    def to_dict(self):
-        return {
-            'email': self.email.to_dict(),
-            'database': self.database.to_dict(),
-            'ai': self.ai.to_dict(),
-            'scheduler': self.scheduler.to_dict(),
-            'notifications': self.notifications.to_dict(),
-            'logging': self.logging.to_dict(),
-            'processing': self.processing.to_dict(),
-            'web': self.web.to_dict()
-        }
+    """
+    Main application configuration.
+    
+    Sections are created on first access, so callers that only read one
+    section don't build the others. Assigning a section (as from_dict does)
+    replaces it directly.
+    """
+    
+    SECTIONS = ('email', 'database', 'ai', 'scheduler', 'notifications', 'logging', 'processing', 'web')
+    
+    @cached_property
+    def email(self) -> EmailConfig:
+        return EmailConfig()
+    
+    @cached_property
+    def database(self) -> DatabaseConfig:
+        return DatabaseConfig()
+    
+    @cached_property
+    def ai(self) -> AIConfig:
+        return AIConfig()
+    
+    @cached_property
+    def scheduler(self) -> SchedulerConfig:
+        return SchedulerConfig()
+    
+    @cached_property
+    def notifications(self) -> NotificationConfig:
+        return NotificationConfig()
+    
+    @cached_property
+    def logging(self) -> LoggingConfig:
+        return LoggingConfig()
+    
+    @cached_property
+    def processing(self) -> ProcessingConfig:
+        return ProcessingConfig()
+    
+    @cached_property
+    def web(self) -> WebConfig:
+        return WebConfig()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name).to_dict() for name in self.SECTIONS}
+    
+    def validate(self) -> None:
+        """
+        Check the settings that depend on each other across the configuration.
+        
+        Raises:
+            ValueError: If a required setting is missing
+        """
+        self.email.validate()
+        self.ai.validate()
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]):
@@ -370,109 +424,141 @@ class AppConfig:
         return config
 
 
+@lru_cache(maxsize=1)
+def _default_config_yaml() -> str:
+    """Render the default configuration as YAML, once per process."""
+    return _yaml_dump(AppConfig().to_dict())
+
+
 class ConfigManager:
     """Manages application configuration loading and validation."""
     
     def __init__(self, config_path: Optional[str] = None):
         self.config_path = config_path or "config.yaml"
         self.config: Optional[AppConfig] = None
+        # Serializes the first load, so concurrent callers share one AppConfig
+        self._lock = threading.RLock()
     
     def load_config(self) -> AppConfig:
         """Load configuration from YAML file."""
-        # Load environment variables from .env file
-        load_dotenv()
+        # Load environment variables from .env file (once per process)
+        _load_dotenv_once()
         
-        if not os.path.exists(self.config_path):
-            raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
+        cache_key = self._cache_key()
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is not None:
+            self.config = cached
+            return self.config
         
-        with open(self.config_path, 'r', encoding='utf-8') as file:
-            config_data = yaml.safe_load(file)
+        config_data = self._read_config_data(cache_key[1], cache_key[2])
+        _intern_settings(config_data)
         
         # Override with environment variables
         config_data = self._override_with_env(config_data)
         
         # Validate configuration
         self.config = AppConfig.from_dict(config_data)
+        _CONFIG_CACHE[cache_key] = self.config
         return self.config
     
+    def _read_config_data(self, mtime_ns: int, size: int) -> Dict[str, Any]:
+        """
+        Parse the config file, reusing the JSON sidecar written by an earlier parse.
+        
+        Args:
+            mtime_ns: Modification time of the config file
+            size: Size of the config file
+        
+        Returns:
+            The parsed configuration data
+        """
+        sidecar_path = self.config_path + '.cache.json'
+        try:
+            sidecar = _json_loads(Path(sidecar_path).read_bytes())
+            # The sidecar is only valid for the exact file version it was made from
+            if sidecar.get('mtime_ns') == mtime_ns and sidecar.get('size') == size:
+                return sidecar['data']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        
+        # libyaml decodes the raw bytes itself, from one contiguous buffer
+        config_data = _yaml_load(Path(self.config_path).read_bytes())
+        
+        # Best effort: an unwritable directory or non-JSON values just skip the sidecar
+        try:
+            payload = _json_dumps({'mtime_ns': mtime_ns, 'size': size, 'data': config_data})
+            tmp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+            # The sidecar holds the password and API keys: owner access only
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as file:
+                os.chmod(tmp_path, 0o600)  # in case a stale temp file had wider permissions
+                file.write(payload)
+            os.replace(tmp_path, sidecar_path)
+        except (OSError, TypeError, ValueError):
+            pass
+        
+        return config_data
+    
+    def _cache_key(self) -> Tuple[Any, ...]:
+        """Identify the config file version and environment overrides a load depends on."""
+        try:
+            stat = os.stat(self.config_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {self.config_path}") from None
+        
+        env_values = tuple(sorted((env_var, os.environ[env_var]) for env_var in _present_env_vars()))
+        return (os.path.abspath(self.config_path), stat.st_mtime_ns, stat.st_size, env_values)
+    
     def _override_with_env(self, config_data: Dict[str, Any]) -> Dict[str, Any]:
         """Override configuration with environment variables."""
-        env_mappings = {
-            'EMAIL_USERNAME': ('email', 'username'),
-            'EMAIL_PASSWORD': ('email', 'password'),
-            'EMAIL_IMAP_SERVER': ('email', 'imap_server'),
-            'EMAIL_IMAP_PORT': ('email', 'imap_port'),
-            'EMAIL_SMTP_SERVER': ('email', 'smtp_server'),
-            'EMAIL_SMTP_PORT': ('email', 'smtp_port'),
-            'EMAIL_USE_GMAIL_API': ('email', 'use_gmail_api'),
-            'EMAIL_CREDENTIALS_FILE': ('email', 'credentials_file'),
-            'EMAIL_TOKEN_FILE': ('email', 'token_file'),
-            'GEMINI_API_KEY': ('ai', 'gemini_api_key'),
-            'OPENAI_API_KEY': ('ai', 'openai_api_key'),
-            'DATABASE_URL': ('database', 'url'),
-            'SLACK_WEBHOOK_URL': ('notifications', 'slack_webhook'),
-            'DISCORD_WEBHOOK_URL': ('notifications', 'discord_webhook'),
-            'WEB_SECRET_KEY': ('web', 'secret_key'),
-             'NOTIFICATION_EMAIL': ('notifications', 'notification_email'),
-        }
+        present = _present_env_vars()
+        if not present:
+            return config_data
         
-        for env_var, config_path in env_mappings.items():
-            env_value = os.getenv(env_var)
-            if env_value:
-                # Navigate to the nested config location
-                current = config_data
-                for key in config_path[:-1]:
-                    if key not in current:
-                        current[key] = {}
-                    current = current[key]
-                
-                # Convert port numbers to integers
-                if config_path[-1] in ['imap_port', 'smtp_port']:
-                    try:
-                        current[config_path[-1]] = int(env_value)
-                    except ValueError:
-                        print(f"Warning: Invalid port number for {env_var}: {env_value}")
-                        continue
-                else:
-                    current[config_path[-1]] = env_value
+        for env_var, section, key in _ENV_MAPPINGS:
+            if env_var not in present:
+                continue
+            env_value = os.environ[env_var]
+            if not env_value:
+                continue
+            
+            # Convert port numbers to integers
+            if key in _INT_KEYS:
+                try:
+                    env_value = int(env_value)
+                except ValueError:
+                    print(f"Warning: Invalid port number for {env_var}: {env_value}")
+                    continue
+            
+            config_data.setdefault(section, {})[key] = env_value
         
         return config_data
     
     def get_config(self) -> AppConfig:
         """Get the current configuration, loading if necessary."""
-        if self.config is None:
-            self.config = self.load_config()
-        return self.config
+        config = self.config
+        if config is not None:
+            return config
+        
+        with self._lock:
+            if self.config is None:
+                self.config = self.load_config()
+            return self.config
     
     def reload_config(self) -> AppConfig:
         """Reload configuration from file."""
-        self.config = None
-        return self.get_config()
+        with self._lock:
+            self.config = None
+            try:
+                _CONFIG_CACHE.pop(self._cache_key(), None)
+            except FileNotFoundError:
+                pass
+            return self.get_config()
     
     def validate_config(self) -> bool:
         """Validate the current configuration."""
         try:
-            config = self.get_config()
-            
-            # Check required fields based on email provider
-            if config.email.use_gmail_api:
-                # For Gmail API, we need credentials file
-                if not os.path.exists(config.email.credentials_file):
-                    raise ValueError(f"Gmail API credentials file not found: {config.email.credentials_file}")
-            else:
-                # For SMTP/IMAP, we need username and password
-                if not config.email.username:
-                    raise ValueError("Email username is required for SMTP/IMAP")
-                
-                if not config.email.password:
-                    raise ValueError("Email password is required for SMTP/IMAP")
-            
-            if config.ai.provider == "gemini" and not config.ai.gemini_api_key:
-                raise ValueError("Gemini API key is required when using Gemini provider")
-            
-            if config.ai.provider == "openai" and not config.ai.openai_api_key:
-                raise ValueError("OpenAI API key is required when using OpenAI provider")
-            
+            self.get_config().validate()
             return True
             
         except Exception as e:
@@ -481,21 +567,17 @@ class ConfigManager:
     
     def create_default_config(self) -> None:
         """Create a default configuration file if it doesn't exist."""
-        if os.path.exists(self.config_path):
-            return
-        
-        default_config = AppConfig()
-        
-        # Convert to dict for YAML serialization
-        config_dict = default_config.to_dict()
-        
         # Create directory if it doesn't exist
         config_dir = os.path.dirname(self.config_path)
         if config_dir:
             os.makedirs(config_dir, exist_ok=True)
         
-        with open(self.config_path, 'w', encoding='utf-8') as file:
-            yaml.dump(config_dict, file, default_flow_style=False, indent=2)
+        # Exclusive create: checks for an existing file and creates it in one step
+        try:
+            with open(self.config_path, 'x', encoding='utf-8') as file:
+                file.write(_default_config_yaml())
+        except FileExistsError:
+            return
         
         print(f"Default configuration created at: {self.config_path}")
 
@@ -506,6 +588,10 @@ config_manager = ConfigManager()
 
 def get_config() -> AppConfig:
     """Get the global configuration instance."""
+    # Fast path once loaded; the manager handles locking for the first load
+    config = config_manager.config
+    if config is not None:
+        return config
     return config_manager.get_config()
 
 
@@ -4,17 +4,29 @@ Provides data storage and retrieval functionality.
 """
 
 from .operations import (
+    get_db_manager,
     get_statistics,
+    get_recent_emails,
+    get_recent_topics,
     store_email,
+    store_emails_batch,
+    has_content_hash,
     store_topic,
+    store_topics_batch,
     log_scan,
     DatabaseManager
 )
 
 __all__ = [
+    'get_db_manager',
     'get_statistics',
+    'get_recent_emails',
+    'get_recent_topics',
     'store_email', 
+    'store_emails_batch',
+    'has_content_hash',
     'store_topic',
+    'store_topics_batch',
     'log_scan',
     'DatabaseManager'
 ] 
\ No newline at end of file
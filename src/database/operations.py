@@ -3,25 +3,196 @@ Database operations for the Email Scanner system.
 Provides data storage and retrieval functionality.
 """
 
+import json
 import os
 import sqlite3
-from typing import Dict, List, Any, Optional
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
+from src.ai.topic_generator import source_email_rows
 from src.config.config_manager import get_config
 from src.utils.logger import get_logger
 
+# SQL lives in module constants so every call hands the connection's statement
+# cache the same text and reuses the compiled statement.
+# Insert statements shared by the single-row and batch store methods.
+# Re-seen emails are updated in place, keeping their row id
+_INSERT_EMAIL_SQL = '''
+    INSERT INTO emails 
+    (uid, subject, sender, recipient, date, category_id, confidence, content_hash, body, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(uid) DO UPDATE SET
+        subject = excluded.subject,
+        sender = excluded.sender,
+        recipient = excluded.recipient,
+        date = excluded.date,
+        category_id = excluded.category_id,
+        confidence = excluded.confidence,
+        content_hash = excluded.content_hash,
+        body = excluded.body,
+        metadata = excluded.metadata,
+        processed_at = CURRENT_TIMESTAMP
+'''
+
+_INSERT_TOPIC_SQL = '''
+    INSERT INTO topics 
+    (title, description, keywords, category_id, source_emails, status)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+_INSERT_SCAN_LOG_SQL = '''
+    INSERT INTO scan_logs 
+    (emails_processed, emails_categorized, topics_generated, status, duration, error_message)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+_INSERT_CATEGORY_SQL = 'INSERT OR IGNORE INTO categories (name) VALUES (?)'
+
+_SELECT_CATEGORY_ID_SQL = 'SELECT id FROM categories WHERE name = ?'
+
+_SELECT_CONTENT_HASH_SQL = 'SELECT 1 FROM emails WHERE content_hash = ? LIMIT 1'
+
+# Dashboard counters and the last scan time in a single round trip
+_SELECT_STATISTICS_SQL = '''
+    SELECT
+        COALESCE((SELECT value FROM stats WHERE key = 'total_emails'), 0),
+        COALESCE((SELECT value FROM stats WHERE key = 'categorized_emails'), 0),
+        COALESCE((SELECT value FROM stats WHERE key = 'topics_generated'), 0),
+        (SELECT scan_time FROM scan_logs ORDER BY scan_time DESC LIMIT 1)
+'''
+
+_SELECT_RECENT_EMAILS_SQL = '''
+    SELECT e.uid, e.subject, e.sender, c.name, e.confidence, e.processed_at
+    FROM emails e
+    LEFT JOIN categories c ON c.id = e.category_id
+    ORDER BY e.processed_at DESC
+    LIMIT ?
+'''
+
+_SELECT_RECENT_TOPICS_SQL = '''
+    SELECT t.title, t.description, c.name, t.status, t.generated_at
+    FROM topics t
+    LEFT JOIN categories c ON c.id = t.category_id
+    ORDER BY t.generated_at DESC
+    LIMIT ?
+'''
+
+# Running row counts for get_statistics, kept current by triggers so the
+# dashboard never has to COUNT(*) the tables
+_STATS_SCHEMA_SQL = (
+    '''
+    CREATE TABLE IF NOT EXISTS stats (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+    ''',
+    "INSERT OR IGNORE INTO stats (key, value) SELECT 'total_emails', COUNT(*) FROM emails",
+    '''
+    INSERT OR IGNORE INTO stats (key, value)
+        SELECT 'categorized_emails', COUNT(*) FROM emails
+        WHERE category_id != (SELECT id FROM categories WHERE name = 'excluded')
+    ''',
+    "INSERT OR IGNORE INTO stats (key, value) SELECT 'topics_generated', COUNT(*) FROM topics",
+    '''
+    CREATE TRIGGER IF NOT EXISTS stats_emails_insert AFTER INSERT ON emails
+    BEGIN
+        UPDATE stats SET value = value + 1 WHERE key = 'total_emails';
+        UPDATE stats SET value = value + 1
+            WHERE key = 'categorized_emails'
+            AND NEW.category_id != (SELECT id FROM categories WHERE name = 'excluded');
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS stats_emails_delete AFTER DELETE ON emails
+    BEGIN
+        UPDATE stats SET value = value - 1 WHERE key = 'total_emails';
+        UPDATE stats SET value = value - 1
+            WHERE key = 'categorized_emails'
+            AND OLD.category_id != (SELECT id FROM categories WHERE name = 'excluded');
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS stats_emails_category AFTER UPDATE OF category_id ON emails
+    BEGIN
+        UPDATE stats
+            SET value = value
+                + COALESCE(NEW.category_id != (SELECT id FROM categories WHERE name = 'excluded'), 0)
+                - COALESCE(OLD.category_id != (SELECT id FROM categories WHERE name = 'excluded'), 0)
+            WHERE key = 'categorized_emails';
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS stats_topics_insert AFTER INSERT ON topics
+    BEGIN
+        UPDATE stats SET value = value + 1 WHERE key = 'topics_generated';
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS stats_topics_delete AFTER DELETE ON topics
+    BEGIN
+        UPDATE stats SET value = value - 1 WHERE key = 'topics_generated';
+    END
+    ''',
+)
+
 
 class DatabaseManager:
     """Manages database operations for the email scanner."""
     
+    # Per-connection tuning: NORMAL sync is safe with WAL, plus a ~20 MB page
+    # cache, in-memory temp tables and a 256 MB memory map
+    CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-20000",
+        "PRAGMA mmap_size=268435456",
+    )
+    
+    # Compiled statements kept per connection, well above the number of distinct
+    # queries issued here so none is ever evicted and re-prepared
+    CACHED_STATEMENTS = 256
+    
+    # Idle read-only connections kept for reuse; busier moments open extra
+    # ones that are closed again when the read finishes
+    READER_POOL_SIZE = 4
+    
+    # Categories stored as rows of the categories lookup table; emails and
+    # topics reference them by id instead of repeating the name in every row
+    KNOWN_CATEGORIES = ('tech', 'newsletter', 'social', 'professional', 'other', 'excluded', 'error')
+    
     def __init__(self):
         self.config = get_config()
         self.logger = get_logger("database")
         self.db_path = self._get_db_path()
         self._ensure_db_directory()
+        # One long-lived connection in autocommit mode for writes, serialized
+        # by the lock. Reads borrow pooled read-only connections (see
+        # _read_cursor), since a read on the writer's connection would run
+        # inside whatever transaction it has open
+        self._conn = self._connect()
+        self._write_lock = threading.Lock()
+        self._idle_readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._category_ids: Dict[str, int] = {}
         self._init_database()
+        
+        # WAL checkpoints run on a background thread instead of inside
+        # whichever commit crosses SQLite's auto-checkpoint threshold
+        self._checkpoint_stop = threading.Event()
+        self._checkpoint_thread: Optional[threading.Thread] = None
+        checkpoint_interval = self.config.database.checkpoint_interval
+        if checkpoint_interval > 0 and self.db_path != ':memory:':
+            self._conn.execute("PRAGMA wal_autocheckpoint=0")
+            self._checkpoint_thread = threading.Thread(
+                target=self._checkpoint_loop,
+                args=(checkpoint_interval,),
+                name="db-checkpoint",
+                daemon=True
+            )
+            self._checkpoint_thread.start()
     
     def _get_db_path(self) -> str:
         """Get the database file path."""
@@ -36,11 +207,46 @@ class DatabaseManager:
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
     
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection to the database with the tuning pragmas applied."""
+        if read_only:
+            database, uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro", True
+        else:
+            database, uri = self.db_path, False
+        conn = sqlite3.connect(
+            database,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=self.CACHED_STATEMENTS,
+            uri=uri
+        )
+        for pragma in self.CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
     def _init_database(self):
         """Initialize the database with required tables."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._write_lock:
+                # Only takes effect before the first table is created
+                self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                # WAL lets readers run alongside a writer and avoids an fsync
+                # per commit; it is persistent, and unsupported in memory
+                if self.db_path != ':memory:':
+                    self._conn.execute("PRAGMA journal_mode=WAL")
+            
+            # Schema changes and the stats seed run in one transaction, so a
+            # concurrent process never sees half a migration and no write is
+            # missed or counted twice
+            with self._transaction(immediate=True) as cursor:
+                # Create categories lookup table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS categories (
+                        id INTEGER PRIMARY KEY,
+                        name TEXT UNIQUE NOT NULL
+                    )
+                ''')
+                cursor.executemany(_INSERT_CATEGORY_SQL, [(name,) for name in self.KNOWN_CATEGORIES])
                 
                 # Create emails table
                 cursor.execute('''
@@ -52,6 +258,7 @@ class DatabaseManager:
                         recipient TEXT,
                         date TEXT,
                         category TEXT,
+                        category_id INTEGER REFERENCES categories(id),
                         confidence REAL,
                         content_hash TEXT,
                         processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -68,6 +275,7 @@ class DatabaseManager:
                         description TEXT,
                         keywords TEXT,
                         category TEXT,
+                        category_id INTEGER REFERENCES categories(id),
                         source_emails TEXT,
                         generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         status TEXT DEFAULT 'pending'
@@ -88,79 +296,275 @@ class DatabaseManager:
                     )
                 ''')
                 
-                conn.commit()
-                self.logger.info("Database initialized successfully")
+                self._migrate_category_names(cursor)
                 
+                for statement in _STATS_SCHEMA_SQL:
+                    cursor.execute(statement)
+                
+                # Newest-first indexes, so the recent/last-scan queries walk
+                # LIMIT rows instead of sorting the whole table
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_emails_processed_at ON emails(processed_at DESC)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_topics_generated_at ON topics(generated_at DESC)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_scan_logs_scan_time ON scan_logs(scan_time DESC)')
+                
+                # Duplicate-content probes; not unique, since the same newsletter
+                # can legitimately arrive under several uids
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_emails_content_hash ON emails(content_hash)')
+                
+                cursor.execute('SELECT name, id FROM categories')
+                self._category_ids = dict(cursor.fetchall())
+            
+            with self._write_lock:
+                # Refresh planner statistics when SQLite thinks they are stale
+                self._conn.execute('PRAGMA optimize')
+            
+            self.logger.info("Database initialized successfully")
+        
         except Exception as e:
             self.logger.error(f"Error initializing database: {e}")
             raise
     
+    @staticmethod
+    def _migrate_category_names(cursor: sqlite3.Cursor):
+        """
+        Move category names stored inline by older versions into category_id.
+        
+        Runs once per table, when the category_id column is added.
+        
+        Args:
+            cursor: Cursor inside the schema transaction
+        """
+        for table in ('emails', 'topics'):
+            cursor.execute(f'PRAGMA table_info({table})')
+            if 'category_id' in {row[1] for row in cursor.fetchall()}:
+                continue
+            
+            if table == 'emails':
+                # The triggers of older versions read the name column; they are
+                # recreated from _STATS_SCHEMA_SQL. The counters themselves are
+                # unchanged by the move, so no trigger may fire during it
+                for trigger in ('stats_emails_insert', 'stats_emails_delete', 'stats_emails_category'):
+                    cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN category_id INTEGER REFERENCES categories(id)')
+            cursor.execute(f'''
+                INSERT OR IGNORE INTO categories (name)
+                SELECT DISTINCT category FROM {table} WHERE category IS NOT NULL
+            ''')
+            cursor.execute(f'''
+                UPDATE {table}
+                SET category_id = (SELECT id FROM categories WHERE name = {table}.category),
+                    category = NULL
+                WHERE category IS NOT NULL
+            ''')
+    
+    @contextmanager
+    def _transaction(self, immediate: bool = False) -> Iterator[sqlite3.Cursor]:
+        """
+        Run a group of writes in one transaction, rolling back on error.
+        
+        Args:
+            immediate: Take the database write lock up front rather than on
+                the first write, for transactions that read before writing
+        """
+        with self._write_lock:
+            self._conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield self._conn.cursor()
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    @contextmanager
+    def _read_cursor(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Cursor for reads, on a read-only connection borrowed from the pool.
+        
+        WAL gives each connection its own snapshot, so reads never see the
+        uncommitted rows of a write in progress. An in-memory database exists
+        only on the writer's connection; reads there take the write lock.
+        """
+        if self.db_path == ':memory:':
+            with self._write_lock:
+                yield self._conn.cursor()
+            return
+        
+        with self._readers_lock:
+            conn = self._idle_readers.pop() if self._idle_readers else None
+        if conn is None:
+            conn = self._connect(read_only=True)
+        
+        try:
+            yield conn.cursor()
+        finally:
+            with self._readers_lock:
+                if len(self._idle_readers) < self.READER_POOL_SIZE:
+                    self._idle_readers.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+    
+    def _category_id(self, category: Optional[str]) -> Optional[int]:
+        """
+        Resolve a category name to its id, adding unseen categories.
+        
+        Must be called with the write lock held and outside a transaction,
+        so a cached id can never be rolled back.
+        
+        Args:
+            category: Category name, or None
+        
+        Returns:
+            The category id, or None for no category
+        """
+        if category is None:
+            return None
+        
+        category_id = self._category_ids.get(category)
+        if category_id is None:
+            self._conn.execute(_INSERT_CATEGORY_SQL, (category,))
+            category_id = self._conn.execute(_SELECT_CATEGORY_ID_SQL, (category,)).fetchone()[0]
+            self._category_ids[category] = category_id
+        return category_id
+    
+    @staticmethod
+    def _email_row(email_data: Dict[str, Any], category_id: Optional[int], confidence: float) -> Tuple[Any, ...]:
+        """Build the emails table parameters for an email."""
+        return (
+            email_data.get('uid'),
+            email_data.get('subject'),
+            email_data.get('from'),
+            email_data.get('to'),
+            email_data.get('date'),
+            category_id,
+            confidence,
+            email_data.get('content_hash'),
+            email_data.get('body'),
+            # Compact JSON so metadata can be read back with json.loads or
+            # queried in SQL with json_extract; headers may be any mapping
+            json.dumps(
+                dict(email_data.get('headers') or {}),
+                separators=(',', ':'),
+                ensure_ascii=False,
+                default=str
+            )
+        )
+    
+    @staticmethod
+    def _topic_row(topic_data: Dict[str, Any], category_id: Optional[int]) -> Tuple[Any, ...]:
+        """Build the topics table parameters for a topic."""
+        keywords = topic_data.get('keywords') or ()
+        return (
+            topic_data.get('title'),
+            topic_data.get('description'),
+            keywords if isinstance(keywords, str) else ','.join(map(str, keywords)),
+            category_id,
+            # One JSON object per source email, whichever layout the topic
+            # generator produced
+            json.dumps(
+                list(source_email_rows(topic_data.get('source_emails') or [])),
+                separators=(',', ':'),
+                ensure_ascii=False,
+                default=str
+            ),
+            topic_data.get('status', 'pending')
+        )
+    
     def store_email(self, email_data: Dict[str, Any], category: str, confidence: float) -> bool:
         """Store an email in the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._write_lock:
+                cursor = self._conn.cursor()
                 
-                cursor.execute('''
-                    INSERT OR REPLACE INTO emails 
-                    (uid, subject, sender, recipient, date, category, confidence, body, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    email_data.get('uid'),
-                    email_data.get('subject'),
-                    email_data.get('from'),
-                    email_data.get('to'),
-                    email_data.get('date'),
-                    category,
-                    confidence,
-                    email_data.get('body'),
-                    str(email_data.get('headers', {}))
-                ))
+                cursor.execute(
+                    _INSERT_EMAIL_SQL,
+                    self._email_row(email_data, self._category_id(category), confidence)
+                )
                 
-                conn.commit()
                 return True
                 
         except Exception as e:
             self.logger.error(f"Error storing email: {e}")
             return False
     
+    def store_emails_batch(self, batch: Iterable[Tuple[Dict[str, Any], str, float]]) -> bool:
+        """
+        Store several emails in a single transaction.
+        
+        Args:
+            batch: (email_data, category, confidence) tuples
+        
+        Returns:
+            bool: True if all emails were stored, False if none were
+        """
+        try:
+            batch = list(batch)
+            with self._write_lock:
+                category_ids = {category: self._category_id(category) for _, category, _ in batch}
+            with self._transaction() as cursor:
+                cursor.executemany(_INSERT_EMAIL_SQL, (
+                    self._email_row(email_data, category_ids[category], confidence)
+                    for email_data, category, confidence in batch
+                ))
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error storing email batch: {e}")
+            return False
+    
     def store_topic(self, topic_data: Dict[str, Any]) -> bool:
         """Store a generated topic in the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._write_lock:
+                cursor = self._conn.cursor()
                 
-                cursor.execute('''
-                    INSERT INTO topics 
-                    (title, description, keywords, category, source_emails, status)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    topic_data.get('title'),
-                    topic_data.get('description'),
-                    ','.join(topic_data.get('keywords', [])),
-                    topic_data.get('category'),
-                    ','.join(topic_data.get('source_emails', [])),
-                    topic_data.get('status', 'pending')
-                ))
+                cursor.execute(
+                    _INSERT_TOPIC_SQL,
+                    self._topic_row(topic_data, self._category_id(topic_data.get('category')))
+                )
                 
-                conn.commit()
                 return True
                 
         except Exception as e:
             self.logger.error(f"Error storing topic: {e}")
             return False
     
+    def store_topics_batch(self, topics: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Store several generated topics in a single transaction.
+        
+        Args:
+            topics: Topic dictionaries
+        
+        Returns:
+            bool: True if all topics were stored, False if none were
+        """
+        try:
+            topics = list(topics)
+            with self._write_lock:
+                category_ids = {
+                    topic_data.get('category'): self._category_id(topic_data.get('category'))
+                    for topic_data in topics
+                }
+            with self._transaction() as cursor:
+                cursor.executemany(_INSERT_TOPIC_SQL, (
+                    self._topic_row(topic_data, category_ids[topic_data.get('category')])
+                    for topic_data in topics
+                ))
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error storing topic batch: {e}")
+            return False
+    
     def log_scan(self, scan_data: Dict[str, Any]) -> bool:
         """Log a scan operation."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._write_lock:
+                cursor = self._conn.cursor()
                 
-                cursor.execute('''
-                    INSERT INTO scan_logs 
-                    (emails_processed, emails_categorized, topics_generated, status, duration, error_message)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
+                cursor.execute(_INSERT_SCAN_LOG_SQL, (
                     scan_data.get('emails_processed', 0),
                     scan_data.get('emails_categorized', 0),
                     scan_data.get('topics_generated', 0),
@@ -169,7 +573,6 @@ class DatabaseManager:
                     scan_data.get('error_message')
                 ))
                 
-                conn.commit()
                 return True
                 
         except Exception as e:
@@ -179,39 +582,25 @@ class DatabaseManager:
     def get_statistics(self) -> Dict[str, Any]:
         """Get system statistics."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Get email statistics
-                cursor.execute('SELECT COUNT(*) FROM emails')
-                total_emails = cursor.fetchone()[0]
-                
-                cursor.execute('SELECT COUNT(*) FROM emails WHERE category != "excluded"')
-                categorized_emails = cursor.fetchone()[0]
-                
-                # Get topic statistics
-                cursor.execute('SELECT COUNT(*) FROM topics')
-                topics_generated = cursor.fetchone()[0]
-                
-                # Get last scan
-                cursor.execute('''
-                    SELECT scan_time, status FROM scan_logs 
-                    ORDER BY scan_time DESC LIMIT 1
-                ''')
-                last_scan_result = cursor.fetchone()
-                last_scan = last_scan_result[0] if last_scan_result else 'Never'
-                
-                # Get database size
-                db_size = self._get_db_size()
-                
-                return {
-                    'total_emails': total_emails,
-                    'categorized_emails': categorized_emails,
-                    'topics_generated': topics_generated,
-                    'last_scan': last_scan,
-                    'db_size': db_size
-                }
-                
+            # Get email and topic counts from the trigger-maintained stats table,
+            # together with the last scan
+            with self._read_cursor() as cursor:
+                cursor.execute(_SELECT_STATISTICS_SQL)
+                total_emails, categorized_emails, topics_generated, last_scan = cursor.fetchone()
+            if last_scan is None:
+                last_scan = 'Never'
+            
+            # Get database size
+            db_size = self._get_db_size()
+            
+            return {
+                'total_emails': total_emails,
+                'categorized_emails': categorized_emails,
+                'topics_generated': topics_generated,
+                'last_scan': last_scan,
+                'db_size': db_size
+            }
+            
         except Exception as e:
             self.logger.error(f"Error getting statistics: {e}")
             return {
@@ -222,6 +611,53 @@ class DatabaseManager:
                 'db_size': 'Unknown'
             }
     
+    def _checkpoint_loop(self, interval: float):
+        """Checkpoint the WAL every interval seconds until the manager is closed."""
+        while not self._checkpoint_stop.wait(interval):
+            self.force_checkpoint()
+    
+    def force_checkpoint(self) -> bool:
+        """
+        Copy the WAL back into the database file and truncate it.
+        
+        Returns:
+            bool: True if the whole WAL was checkpointed, False if readers
+            kept part of it alive or the checkpoint failed
+        """
+        try:
+            with self._write_lock:
+                busy, wal_pages, checkpointed = self._conn.execute(
+                    "PRAGMA wal_checkpoint(TRUNCATE)"
+                ).fetchone()
+            
+            if busy:
+                self.logger.debug(
+                    f"WAL checkpoint blocked by readers: {checkpointed}/{wal_pages} pages copied"
+                )
+                return False
+            
+            self.logger.debug(f"WAL checkpoint copied {checkpointed} pages")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error checkpointing database: {e}")
+            return False
+    
+    def close(self):
+        """Checkpoint the WAL and close the database connection."""
+        self._checkpoint_stop.set()
+        if self._checkpoint_thread is not None:
+            self._checkpoint_thread.join()
+            self.force_checkpoint()
+        
+        with self._readers_lock:
+            for conn in self._idle_readers:
+                conn.close()
+            self._idle_readers.clear()
+        
+        with self._write_lock:
+            self._conn.close()
+    
     def _get_db_size(self) -> str:
         """Get the database file size."""
         try:
@@ -237,32 +673,44 @@ class DatabaseManager:
         except Exception:
             return "Unknown"
     
+    def has_content_hash(self, content_hash: str) -> bool:
+        """
+        Check whether an email with the same content has already been stored.
+        
+        Args:
+            content_hash: Hash from EmailCategorizer's content analysis
+            
+        Returns:
+            True if a stored email has this content hash
+        """
+        try:
+            with self._read_cursor() as cursor:
+                cursor.execute(_SELECT_CONTENT_HASH_SQL, (content_hash,))
+                return cursor.fetchone() is not None
+            
+        except Exception as e:
+            self.logger.error(f"Error checking content hash: {e}")
+            return False
+    
     def get_recent_emails(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent emails from the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT uid, subject, sender, category, confidence, processed_at
-                    FROM emails 
-                    ORDER BY processed_at DESC 
-                    LIMIT ?
-                ''', (limit,))
-                
+            with self._read_cursor() as cursor:
+                cursor.execute(_SELECT_RECENT_EMAILS_SQL, (limit,))
                 rows = cursor.fetchall()
-                return [
-                    {
-                        'uid': row[0],
-                        'subject': row[1],
-                        'sender': row[2],
-                        'category': row[3],
-                        'confidence': row[4],
-                        'processed_at': row[5]
-                    }
-                    for row in rows
-                ]
-                
+            
+            return [
+                {
+                    'uid': row[0],
+                    'subject': row[1],
+                    'sender': row[2],
+                    'category': row[3],
+                    'confidence': row[4],
+                    'processed_at': row[5]
+                }
+                for row in rows
+            ]
+            
         except Exception as e:
             self.logger.error(f"Error getting recent emails: {e}")
             return []
@@ -270,52 +718,83 @@ class DatabaseManager:
     def get_recent_topics(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent topics from the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT title, description, category, status, generated_at
-                    FROM topics 
-                    ORDER BY generated_at DESC 
-                    LIMIT ?
-                ''', (limit,))
-                
+            with self._read_cursor() as cursor:
+                cursor.execute(_SELECT_RECENT_TOPICS_SQL, (limit,))
                 rows = cursor.fetchall()
-                return [
-                    {
-                        'title': row[0],
-                        'description': row[1],
-                        'category': row[2],
-                        'status': row[3],
-                        'generated_at': row[4]
-                    }
-                    for row in rows
-                ]
-                
+            
+            return [
+                {
+                    'title': row[0],
+                    'description': row[1],
+                    'category': row[2],
+                    'status': row[3],
+                    'generated_at': row[4]
+                }
+                for row in rows
+            ]
+            
         except Exception as e:
             self.logger.error(f"Error getting recent topics: {e}")
             return []
 
 
-# Global database manager instance
-db_manager = DatabaseManager()
+# Global database manager instance, created on first use so importing this
+# module does not open or migrate the database
+_db_manager: Optional[DatabaseManager] = None
+_db_manager_lock = threading.Lock()
+
+
+def get_db_manager() -> DatabaseManager:
+    """Get the global database manager, creating it on first call."""
+    global _db_manager
+    
+    if _db_manager is None:
+        with _db_manager_lock:
+            if _db_manager is None:
+                _db_manager = DatabaseManager()
+    return _db_manager
 
 
 def get_statistics() -> Dict[str, Any]:
     """Get system statistics."""
-    return db_manager.get_statistics()
+    return get_db_manager().get_statistics()
+
+
+def get_recent_emails(limit: int = 10) -> List[Dict[str, Any]]:
+    """Get recent emails from the database."""
+    return get_db_manager().get_recent_emails(limit)
+
+
+def get_recent_topics(limit: int = 10) -> List[Dict[str, Any]]:
+    """Get recent topics from the database."""
+    return get_db_manager().get_recent_topics(limit)
 
 
 def store_email(email_data: Dict[str, Any], category: str, confidence: float) -> bool:
     """Store an email in the database."""
-    return db_manager.store_email(email_data, category, confidence)
+    return get_db_manager().store_email(email_data, category, confidence)
+
+
+def store_emails_batch(batch: Iterable[Tuple[Dict[str, Any], str, float]]) -> bool:
+    """Store several emails in the database in one transaction."""
+    return get_db_manager().store_emails_batch(batch)
+
+
+def has_content_hash(content_hash: str) -> bool:
+    """Check whether an email with the same content has already been stored."""
+    return get_db_manager().has_content_hash(content_hash)
 
 
 def store_topic(topic_data: Dict[str, Any]) -> bool:
     """Store a generated topic in the database."""
-    return db_manager.store_topic(topic_data)
+    return get_db_manager().store_topic(topic_data)
+
+
+def store_topics_batch(topics: Iterable[Dict[str, Any]]) -> bool:
+    """Store several generated topics in the database in one transaction."""
+    return get_db_manager().store_topics_batch(topics)
 
 
 def log_scan(scan_data: Dict[str, Any]) -> bool:
     """Log a scan operation."""
-    return db_manager.log_scan(scan_data) 
\ No newline at end of file
+    return get_db_manager().log_scan(scan_data) 
\ No newline at end of file
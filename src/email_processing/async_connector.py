@@ -0,0 +1,276 @@
+"""
+Asynchronous Gmail IMAP connector for the Email Scanner system.
+Fetches several folders at once over aioimaplib connections, so their
+round trips overlap instead of running one after another.
+"""
+
+import asyncio
+import re
+import ssl
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from src.config.config_manager import get_config
+from src.utils.logger import get_logger
+from src.email_processing.connector import GmailConnector
+
+try:
+    import aioimaplib
+except ImportError:  # optional, only needed for AsyncGmailConnector
+    aioimaplib = None
+
+
+# Literal announcement ending a FETCH response line, e.g. b'... RFC822 {2048}'
+_LITERAL_RE = re.compile(rb'\{(\d+)\}$')
+_UIDVALIDITY_RE = re.compile(rb'\[UIDVALIDITY (\d+)\]')
+
+
+def _as_fetch_data(lines: List[Any]) -> List[Any]:
+    """Reshape aioimaplib FETCH response lines into imaplib's (response, literal) form."""
+    msg_data = []
+    pending = None
+    for line in lines:
+        if pending is not None:
+            msg_data.append((pending, bytes(line)))
+            pending = None
+        elif isinstance(line, (bytes, bytearray)) and _LITERAL_RE.search(line):
+            pending = bytes(line)
+        else:
+            msg_data.append(bytes(line))
+    return msg_data
+
+
+class AsyncGmailConnector:
+    """
+    Gmail IMAP connector built on asyncio.
+    
+    aioimaplib queues commands that share a response type, so FETCHes on one
+    connection still go out one at a time; overlap comes from fetching each
+    folder over its own connection. Parsing and the UID watermark are shared
+    with GmailConnector.
+    """
+    
+    def __init__(self):
+        self.config = get_config()
+        self.logger = get_logger("async_gmail_connector")
+        self.imap_connection = None
+        self._parser = GmailConnector()
+    
+    async def connect(self) -> bool:
+        """Establish connection to Gmail IMAP server."""
+        if aioimaplib is None:
+            self.logger.error("aioimaplib is not installed; use GmailConnector instead")
+            return False
+        
+        try:
+            self.imap_connection = aioimaplib.IMAP4_SSL(
+                self.config.email.imap_server,
+                self.config.email.imap_port,
+                ssl_context=ssl.create_default_context()
+            )
+            await self.imap_connection.wait_hello_from_server()
+            
+            response = await self.imap_connection.login(
+                self.config.email.username,
+                self.config.email.password
+            )
+            if response.result != 'OK':
+                self.logger.error(f"IMAP authentication failed: {response.lines}")
+                self.imap_connection = None
+                return False
+            
+            self.logger.info(f"Successfully connected to Gmail IMAP as {self.config.email.username}")
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"IMAP connection failed: {e}")
+            self.imap_connection = None
+            return False
+    
+    async def disconnect(self):
+        """Close the IMAP connection."""
+        if self.imap_connection:
+            connection, self.imap_connection = self.imap_connection, None
+            try:
+                await connection.logout()
+                self.logger.info("IMAP connection closed")
+            except Exception as e:
+                self.logger.error(f"Error closing IMAP connection: {e}")
+    
+    async def fetch_emails(self,
+                           folder: str = "INBOX",
+                           limit: int = 50,
+                           days_back: int = 7,
+                           unread_only: bool = False,
+                           headers_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Fetch emails from one folder over this connector's connection.
+        
+        Args:
+            folder: Email folder to search (default: INBOX)
+            limit: Maximum number of emails to fetch
+            days_back: Number of days back to search
+            unread_only: Only fetch unread emails
+            headers_only: Only fetch headers (no body or attachments), for listings
+        
+        Returns:
+            List of email dictionaries with metadata and content
+        """
+        emails = []
+        
+        try:
+            response = await self.imap_connection.select(folder)
+            if response.result != 'OK':
+                self.logger.error(f"Could not select folder {folder}: {response.lines}")
+                return emails
+            
+            # Only fetch messages newer than the previous scan
+            track_uids = self.config.email.incremental_fetch and not headers_only
+            last_uid = 0
+            if track_uids:
+                uidvalidity = self._get_uidvalidity(response.lines)
+                last_uid = self._parser._get_uid_watermark(folder, uidvalidity)
+            
+            # Build search criteria
+            search_criteria = []
+            
+            if last_uid:
+                search_criteria.append(f"UID {last_uid + 1}:*")
+            
+            if unread_only:
+                search_criteria.append("UNSEEN")
+            
+            if days_back > 0:
+                date_since = (datetime.now() - timedelta(days=days_back)).strftime("%d-%b-%Y")
+                search_criteria.append(f'SINCE "{date_since}"')
+            
+            search_string = " ".join(search_criteria) if search_criteria else "ALL"
+            
+            response = await self.imap_connection.uid_search(search_string, charset=None)
+            if response.result != 'OK':
+                self.logger.error(f"Search failed in {folder}: {response.lines}")
+                return emails
+            
+            # Without matches the first line is the completion text, not UIDs
+            email_list = [uid for uid in response.lines[0].split() if uid.isdigit()]
+            if last_uid:
+                # "n:*" always matches the newest message, even below n
+                email_list = [uid for uid in email_list if int(uid) > last_uid]
+            
+            if not email_list:
+                self.logger.info(f"No emails found matching criteria in {folder}")
+                return emails
+            
+            if limit:
+                email_list = email_list[-limit:]
+            
+            self.logger.info(f"Found {len(email_list)} emails to process in {folder}")
+            
+            batch_size = max(1, self.config.email.fetch_batch_size)
+            for start in range(0, len(email_list), batch_size):
+                batch = email_list[start:start + batch_size]
+                emails.extend(await self._fetch_email_batch(batch, headers_only))
+            
+            if track_uids:
+                self._parser._stage_uid_watermark(folder, uidvalidity, last_uid, email_list, emails)
+            
+            return emails
+        
+        except Exception as e:
+            self.logger.error(f"Error fetching emails from {folder}: {e}")
+            return emails
+    
+    async def fetch_emails_multi(self,
+                                 folders: List[str],
+                                 limit: int = 50,
+                                 days_back: int = 7,
+                                 unread_only: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch emails from several folders concurrently, one connection per folder.
+        
+        Args:
+            folders: Email folders to search
+            limit: Maximum number of emails to fetch per folder
+            days_back: Number of days back to search
+            unread_only: Only fetch unread emails
+        
+        Returns:
+            Dictionary mapping each folder to its list of email dictionaries
+        """
+        folders = list(dict.fromkeys(folders))
+        if not folders:
+            return {}
+        
+        # Stay within Gmail's limit on simultaneous connections per account
+        slots = asyncio.Semaphore(GmailConnector.MAX_FOLDER_WORKERS)
+        
+        async def fetch_folder(folder: str) -> List[Dict[str, Any]]:
+            async with slots:
+                worker = AsyncGmailConnector()
+                if not await worker.connect():
+                    self.logger.error(f"Could not open a connection for folder {folder}")
+                    return []
+                try:
+                    emails = await worker.fetch_emails(folder, limit, days_back, unread_only)
+                    self._parser._pending_watermarks.update(worker._parser._pending_watermarks)
+                    return emails
+                finally:
+                    await worker.disconnect()
+        
+        results = await asyncio.gather(*(fetch_folder(folder) for folder in folders))
+        return dict(zip(folders, results))
+    
+    def commit_uid_watermark(self):
+        """Save the watermarks of this connector's fetches; see GmailConnector.commit_uid_watermark."""
+        self._parser.commit_uid_watermark()
+    
+    async def _fetch_email_batch(self,
+                                 email_uids: List[bytes],
+                                 headers_only: bool = False) -> List[Dict[str, Any]]:
+        """Fetch and parse several emails with a single UID FETCH command."""
+        message_parts = GmailConnector.FETCH_HEADERS if headers_only else GmailConnector.FETCH_FULL
+        
+        try:
+            response = await self.imap_connection.uid(
+                'fetch', b",".join(email_uids).decode(), message_parts
+            )
+            email_bodies = GmailConnector._literals_by_uid(_as_fetch_data(response.lines))
+        except Exception as e:
+            self.logger.error(f"Batch fetch of {len(email_uids)} emails failed: {e}")
+            return []
+        
+        emails = []
+        for uid in email_uids:
+            email_body = email_bodies.get(uid)
+            if email_body is None:
+                self.logger.warning(f"Email {uid.decode()} missing from FETCH response")
+                continue
+            email_data = self._parser._parse_email(uid, email_body, headers_only)
+            if email_data:
+                emails.append(email_data)
+        
+        return emails
+    
+    @staticmethod
+    def _get_uidvalidity(select_lines: List[Any]) -> Optional[str]:
+        """UIDVALIDITY of the selected folder, from the SELECT response."""
+        for line in select_lines:
+            match = _UIDVALIDITY_RE.search(bytes(line))
+            if match:
+                return match.group(1).decode()
+        return None
+
+
+def fetch_folders(folders: List[str],
+                  limit: int = 50,
+                  days_back: int = 7,
+                  unread_only: bool = False,
+                  connector: Optional[AsyncGmailConnector] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch several folders concurrently from synchronous code.
+    
+    Pass a connector to call its commit_uid_watermark() once the emails
+    have been processed; otherwise later scans fetch them again.
+    """
+    connector = connector or AsyncGmailConnector()
+    return asyncio.run(connector.fetch_emails_multi(folders, limit, days_back, unread_only))
@@ -0,0 +1,219 @@
+"""
+IMAP FETCH response parsing for the Email Scanner system.
+Turns imaplib FETCH responses into per-message attributes and reads BODYSTRUCTURE,
+so text parts can be downloaded without the attachments around them.
+"""
+
+import base64
+import email.utils
+import quopri
+import re
+from email.message import Message
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+# Parenthesis, quoted string, literal marker (always last on its line) or atom
+_TOKEN_RE = re.compile(rb'\s*(?:(\()|(\))|"((?:[^"\\]|\\.)*)"|\{(\d+)\}\s*$|([^\s()"]+))')
+_ESCAPE_RE = re.compile(rb'\\(.)')
+
+# List delimiters, kept distinct from quoted "(" and ")" strings
+_OPEN = object()
+_CLOSE = object()
+
+
+class BodyPart(NamedTuple):
+    """A leaf or container part described by BODYSTRUCTURE."""
+    
+    section: str
+    content_type: str
+    encoding: str
+    octets: int
+    disposition: Optional[str]
+    filename: Optional[str]
+
+
+def _tokens(msg_data: List[Any]) -> Iterator[Any]:
+    """Tokenize an imaplib FETCH response, splicing literals in where they occur."""
+    for item in msg_data:
+        if isinstance(item, tuple):
+            text, literal = item
+        elif isinstance(item, bytes):
+            text, literal = item, None
+        else:
+            continue
+        
+        pos = 0
+        while True:
+            match = _TOKEN_RE.match(text, pos)
+            if not match:
+                break
+            pos = match.end()
+            
+            open_paren, close_paren, quoted, literal_size, atom = match.groups()
+            if open_paren:
+                yield _OPEN
+            elif close_paren:
+                yield _CLOSE
+            elif quoted is not None:
+                yield _ESCAPE_RE.sub(rb'\1', quoted)
+            elif literal_size is not None:
+                yield literal
+            else:
+                yield None if atom.upper() == b'NIL' else atom
+
+
+def parse_fetch_response(msg_data: List[Any]) -> Dict[bytes, Dict[bytes, Any]]:
+    """
+    Parse a UID FETCH response into attributes per message.
+    
+    Args:
+        msg_data: Data returned by imaplib's uid("FETCH", ...)
+    
+    Returns:
+        Dictionary mapping each UID to its attributes (e.g. b'BODY[1]'); lists
+        become nested Python lists, NIL becomes None
+    """
+    tokens = _tokens(msg_data)
+    
+    def parse_list() -> List[Any]:
+        items = []
+        for token in tokens:
+            if token is _CLOSE:
+                return items
+            items.append(parse_list() if token is _OPEN else token)
+        raise ValueError("Unterminated list in FETCH response")
+    
+    messages = {}
+    for token in tokens:
+        # Skip the message sequence number in front of each attribute list
+        if token is _OPEN:
+            attributes = parse_list()
+            fields = {
+                name.upper(): value
+                for name, value in zip(attributes[::2], attributes[1::2])
+                if isinstance(name, bytes)
+            }
+            uid = fields.get(b'UID')
+            if uid is not None:
+                messages[uid] = fields
+    
+    return messages
+
+
+def _text(value: Any) -> str:
+    """Decode a BODYSTRUCTURE string field; NIL becomes an empty string."""
+    return value.decode('utf-8', errors='replace') if isinstance(value, bytes) else ""
+
+
+def _params(value: Any) -> List[Tuple[str, str]]:
+    """Turn a ("name" "value" ...) parameter list into pairs."""
+    if not isinstance(value, list):
+        return []
+    return [(_text(name), _text(param)) for name, param in zip(value[::2], value[1::2])]
+
+
+def _filename(disposition: Optional[str],
+              disposition_params: List[Tuple[str, str]],
+              content_type: str,
+              type_params: List[Tuple[str, str]]) -> Optional[str]:
+    """Resolve the attachment filename the way Message.get_filename() would."""
+    message = Message()
+    message['Content-Type'] = "; ".join(
+        [content_type] + [f'{name}="{email.utils.quote(value)}"' for name, value in type_params]
+    )
+    if disposition:
+        message['Content-Disposition'] = "; ".join(
+            [disposition] + [f'{name}="{email.utils.quote(value)}"' for name, value in disposition_params]
+        )
+    return message.get_filename()
+
+
+def _disposition(value: Any) -> Tuple[Optional[str], List[Tuple[str, str]]]:
+    """Read a ("attachment" ("filename" "x")) disposition field."""
+    if not isinstance(value, list) or not value:
+        return None, []
+    return _text(value[0]).lower(), _params(value[1] if len(value) > 1 else None)
+
+
+def body_parts(structure: List[Any], section: str = "") -> List[BodyPart]:
+    """
+    Flatten a BODYSTRUCTURE into its parts, in the order Message.walk() visits them.
+    
+    Args:
+        structure: Parsed BODYSTRUCTURE value
+        section: Section number of this part ("" for the top-level message)
+    
+    Returns:
+        List of parts with their section numbers for BODY[<section>]
+    """
+    if isinstance(structure[0], list):
+        # multipart: child parts, subtype, then extension data
+        children = []
+        index = 0
+        while index < len(structure) and isinstance(structure[index], list):
+            children.append(structure[index])
+            index += 1
+        
+        subtype = _text(structure[index]).lower() if index < len(structure) else "mixed"
+        extension = structure[index + 1:]
+        disposition, disposition_params = _disposition(extension[1] if len(extension) > 1 else None)
+        
+        parts = [BodyPart(section or "TEXT", f"multipart/{subtype}", "7bit", 0, disposition, None)]
+        for number, child in enumerate(children, 1):
+            parts.extend(body_parts(child, f"{section}.{number}" if section else str(number)))
+        return parts
+    
+    content_type = f"{_text(structure[0])}/{_text(structure[1])}".lower()
+    type_params = _params(structure[2])
+    encoding = _text(structure[5]).lower() or "7bit"
+    octets = int(structure[6]) if structure[6] else 0
+    
+    # Fields after the size depend on the type: text parts add a line count,
+    # message/rfc822 adds the envelope, the inner body and a line count
+    if content_type == "message/rfc822" and len(structure) > 9:
+        extension_start = 10
+    elif content_type.startswith("text/"):
+        extension_start = 8
+    else:
+        extension_start = 7
+    extension = structure[extension_start:]
+    disposition, disposition_params = _disposition(extension[1] if len(extension) > 1 else None)
+    
+    filename = None
+    if disposition == "attachment":
+        filename = _filename(disposition, disposition_params, content_type, type_params)
+    
+    parts = [BodyPart(section or "TEXT", content_type, encoding, octets, disposition, filename)]
+    
+    if content_type == "message/rfc822" and len(structure) > 9:
+        # The encapsulated message's own parts continue the numbering; a
+        # non-multipart inner body is part <section>.1
+        inner = structure[8]
+        inner_section = section or "1"
+        if isinstance(inner[0], list):
+            parts.extend(body_parts(inner, inner_section))
+        else:
+            parts.extend(body_parts(inner, f"{inner_section}.1"))
+    
+    return parts
+
+
+def decode_section(data: Optional[bytes], encoding: str) -> bytes:
+    """Undo a part's Content-Transfer-Encoding."""
+    if not data:
+        return b""
+    if encoding == "base64":
+        # Non-alphabet characters such as line breaks are discarded
+        return base64.b64decode(data)
+    if encoding == "quoted-printable":
+        return quopri.decodestring(data)
+    return data
+
+
+def estimate_size(octets: int, encoding: str) -> int:
+    """Estimate a part's decoded size from its encoded size in octets."""
+    if encoding == "base64":
+        # 76 characters plus CRLF per line, 4 characters per 3 bytes
+        lines = -(-octets // 78)
+        return max(octets - 2 * lines, 0) * 3 // 4
+    return octets
@@ -3,8 +3,12 @@ Email categorizer for the Email Scanner system.
 Provides additional categorization logic and utilities.
 """
 
+import os
 import re
-from typing import Dict, List, Any, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Collection, Dict, FrozenSet, List, Any, Optional, Set, Tuple
 from datetime import datetime
 import hashlib
 
@@ -15,12 +19,29 @@ from src.utils.logger import get_logger
 class EmailCategorizer:
     """Advanced email categorization with content analysis."""
     
+    # Batches at or below this size are analyzed in-process
+    PARALLEL_THRESHOLD = 100
+    
+    # Emails below this length or of these content types are never used for topics
+    MIN_TOPIC_WORDS = 50
+    UNSUITABLE_CONTENT_TYPES = frozenset({'notification', 'promotional'})
+    
+    # Common words ignored by key topic extraction
+    STOP_WORDS = frozenset({
+        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+        'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+        'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+        'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those',
+        'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her',
+        'us', 'them', 'my', 'your', 'his', 'her', 'its', 'our', 'their'
+    })
+    
     def __init__(self):
         self.config = get_config()
         self.logger = get_logger("email_categorizer")
         
         # Content type patterns
-        self.content_patterns = {
+        self.content_patterns: Dict[str, List[str]] = {
             'article': [
                 r'\barticle\b', r'\bpost\b', r'\bblog\b', r'\bstory\b',
                 r'\bnews\b', r'\bupdate\b', r'\bannouncement\b'
@@ -40,7 +61,7 @@ class EmailCategorizer:
         }
         
         # Language patterns for content analysis
-        self.language_indicators = {
+        self.language_indicators: Dict[str, List[str]] = {
             'technical': [
                 'api', 'database', 'server', 'client', 'protocol', 'algorithm',
                 'framework', 'library', 'dependency', 'deployment', 'infrastructure',
@@ -55,13 +76,79 @@ class EmailCategorizer:
                 'documentation', 'example', 'demo', 'sample', 'best practice'
             ]
         }
+        
+        # Word lists for sentiment analysis
+        self.positive_words: List[str] = [
+            'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'awesome',
+            'good', 'nice', 'happy', 'excited', 'successful', 'achieved',
+            'improved', 'better', 'best', 'love', 'like', 'enjoy'
+        ]
+        
+        self.negative_words: List[str] = [
+            'bad', 'terrible', 'awful', 'horrible', 'disappointing', 'failed',
+            'error', 'problem', 'issue', 'broken', 'wrong', 'hate', 'dislike',
+            'angry', 'frustrated', 'sad', 'worried', 'concerned'
+        ]
+        
+        # Compiled once here so analysis calls skip the re module's pattern cache.
+        # Each word list becomes a single alternation, so scoring a category is
+        # one pass over the text instead of one pass per word
+        self._content_alts: Dict[str, re.Pattern] = {
+            content_type: self._compile_alternation(
+                [pattern.replace(r'\b', '') for pattern in patterns], word_boundary=True
+            )
+            for content_type, patterns in self.content_patterns.items()
+        }
+        
+        # Style and sentiment words are matched as whole tokens with set lookups;
+        # multi-word indicators such as 'best practice' keep a whole-word regex
+        self._style_words: Dict[str, FrozenSet[str]] = {}
+        self._style_phrases: Dict[str, re.Pattern] = {}
+        for style, indicators in self.language_indicators.items():
+            self._style_words[style] = frozenset(word for word in indicators if ' ' not in word)
+            phrases = [word for word in indicators if ' ' in word]
+            if phrases:
+                self._style_phrases[style] = self._compile_alternation(phrases, word_boundary=True)
+        self._positive_words: FrozenSet[str] = frozenset(self.positive_words)
+        self._negative_words: FrozenSet[str] = frozenset(self.negative_words)
+        self._sentence_re = re.compile(r'[.!?]+')
+        self._word_re = re.compile(r'\b\w+\b')
+        self._vowel_group_re = re.compile(r'[aeiouy]+')
+        self._url_re = re.compile(
+            r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\(\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
+        )
+    
+    @staticmethod
+    def _compile_alternation(words: List[str], word_boundary: bool = False) -> re.Pattern:
+        """
+        Compile a list of words into one alternation pattern.
+        
+        Args:
+            words: Literal words or phrases to match
+            word_boundary: Only match whole words
+            
+        Returns:
+            Compiled pattern whose findall yields each matched word
+        """
+        alternation = '|'.join(re.escape(word) for word in words)
+        if word_boundary:
+            return re.compile(rf'\b({alternation})\b')
+        return re.compile(f'({alternation})')
     
-    def analyze_email_content(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _count_distinct(pattern: re.Pattern, text: str) -> int:
+        """Count how many different words of an alternation occur in text."""
+        return len(set(pattern.findall(text)))
+    
+    def analyze_email_content(self, email_data: Dict[str, Any], full: bool = True) -> Dict[str, Any]:
         """
         Perform detailed content analysis of an email.
         
         Args:
             email_data: Dictionary containing email information
+            full: Run every analysis. When False, sentiment, readability and
+                key topics are left out for emails that should_process_for_topics
+                would reject on length or content type alone
             
         Returns:
             Dictionary with content analysis results
@@ -71,19 +158,38 @@ class EmailCategorizer:
             body = email_data.get('body', '')
             from_address = email_data.get('from', '')
             
+            # Lowercase and split once; every helper below works on these
+            body_lower = body.lower()
+            subject_body_lower = f"{subject.lower()} {body_lower}"
+            word_count = len(body_lower.split())
+            body_words = self._word_re.findall(body_lower)
+            body_tokens = set(body_words)
+            content_type = self._determine_content_type(subject_body_lower)
+            
             analysis = {
-                'content_type': self._determine_content_type(subject, body),
-                'language_style': self._analyze_language_style(body),
-                'sentiment': self._analyze_sentiment(subject, body),
-                'readability': self._calculate_readability(body),
-                'key_topics': self._extract_key_topics(body),
+                'content_type': content_type,
+                'language_style': self._analyze_language_style(body_lower, body_tokens)
+            }
+            
+            # The cheap signals decide whether the costlier analyses can matter
+            if full or (
+                word_count >= self.MIN_TOPIC_WORDS
+                and content_type not in self.UNSUITABLE_CONTENT_TYPES
+            ):
+                analysis['sentiment'] = self._analyze_sentiment(
+                    body_tokens.union(self._word_re.findall(subject.lower()))
+                )
+                analysis['readability'] = self._calculate_readability(body_lower, word_count)
+                analysis['key_topics'] = self._extract_key_topics(body_words)
+            
+            analysis.update({
                 'links': self._extract_links(body),
                 'has_attachments': len(email_data.get('attachments', [])) > 0,
-                'word_count': len(body.split()),
+                'word_count': word_count,
                 'character_count': len(body),
                 'content_hash': self._generate_content_hash(body),
                 'timestamp': datetime.now().isoformat()
-            }
+            })
             
             return analysis
             
@@ -94,17 +200,47 @@ class EmailCategorizer:
                 'timestamp': datetime.now().isoformat()
             }
     
-    def _determine_content_type(self, subject: str, body: str) -> str:
-        """Determine the type of content in the email."""
-        text = f"{subject} {body}".lower()
-        
-        scores = {}
-        for content_type, patterns in self.content_patterns.items():
-            score = 0
-            for pattern in patterns:
-                if re.search(pattern, text):
-                    score += 1
-            scores[content_type] = score
+    def analyze_batch(self, emails: List[Dict[str, Any]], workers: Optional[int] = None,
+                      full: bool = True) -> List[Dict[str, Any]]:
+        """
+        Analyze a batch of emails across worker processes.
+        
+        Small batches are analyzed in-process, since starting the pool
+        costs more than the analysis itself.
+        
+        Args:
+            emails: List of email data dictionaries
+            workers: Number of worker processes (defaults to the CPU count)
+            full: Passed through to analyze_email_content
+            
+        Returns:
+            Analysis results in the same order as the input
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers < 2 or len(emails) <= self.PARALLEL_THRESHOLD:
+            return self._analyze_chunk(emails, full)
+        
+        chunk_size = -(-len(emails) // workers)
+        chunks = [emails[i:i + chunk_size] for i in range(0, len(emails), chunk_size)]
+        
+        try:
+            with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+                analyze = partial(self._analyze_chunk, full=full)
+                return [analysis for chunk in pool.map(analyze, chunks) for analysis in chunk]
+        except Exception as e:
+            self.logger.warning(f"Parallel analysis failed, analyzing sequentially: {e}")
+            return self._analyze_chunk(emails, full)
+    
+    def _analyze_chunk(self, emails: List[Dict[str, Any]], full: bool = True) -> List[Dict[str, Any]]:
+        """Analyze one chunk of emails, in-process or inside a worker process."""
+        return [self.analyze_email_content(email_data, full) for email_data in emails]
+    
+    def _determine_content_type(self, text_lower: str) -> str:
+        """Determine the type of content in the email from its lowercased subject and body."""
+        scores = {
+            content_type: self._count_distinct(pattern, text_lower)
+            for content_type, pattern in self._content_alts.items()
+        }
         
         # Return the content type with the highest score
         if scores:
@@ -112,38 +248,23 @@ class EmailCategorizer:
         
         return 'general'
     
-    def _analyze_language_style(self, body: str) -> Dict[str, float]:
-        """Analyze the language style of the email content."""
-        text = body.lower()
-        scores = {}
+    def _analyze_language_style(self, body_lower: str, body_tokens: Set[str]) -> Dict[str, float]:
+        """Analyze the language style of the lowercased email body and its word set."""
+        scores: Dict[str, float] = {}
         
         for style, indicators in self.language_indicators.items():
-            score = 0
-            for indicator in indicators:
-                if indicator in text:
-                    score += 1
+            score: int = len(self._style_words[style] & body_tokens)
+            phrases = self._style_phrases.get(style)
+            if phrases is not None:
+                score += self._count_distinct(phrases, body_lower)
             scores[style] = score / len(indicators) if indicators else 0
         
         return scores
     
-    def _analyze_sentiment(self, subject: str, body: str) -> str:
-        """Simple sentiment analysis of email content."""
-        text = f"{subject} {body}".lower()
-        
-        positive_words = [
-            'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'awesome',
-            'good', 'nice', 'happy', 'excited', 'successful', 'achieved',
-            'improved', 'better', 'best', 'love', 'like', 'enjoy'
-        ]
-        
-        negative_words = [
-            'bad', 'terrible', 'awful', 'horrible', 'disappointing', 'failed',
-            'error', 'problem', 'issue', 'broken', 'wrong', 'hate', 'dislike',
-            'angry', 'frustrated', 'sad', 'worried', 'concerned'
-        ]
-        
-        positive_count = sum(1 for word in positive_words if word in text)
-        negative_count = sum(1 for word in negative_words if word in text)
+    def _analyze_sentiment(self, tokens: Set[str]) -> str:
+        """Simple sentiment analysis over the set of words in the subject and body."""
+        positive_count = len(self._positive_words & tokens)
+        negative_count = len(self._negative_words & tokens)
         
         if positive_count > negative_count:
             return 'positive'
@@ -152,21 +273,20 @@ class EmailCategorizer:
         else:
             return 'neutral'
     
-    def _calculate_readability(self, body: str) -> Dict[str, float]:
-        """Calculate readability metrics for the email content."""
-        sentences = re.split(r'[.!?]+', body)
-        words = body.split()
+    def _calculate_readability(self, body_lower: str, word_count: int) -> Dict[str, float]:
+        """Calculate readability metrics for the lowercased email body."""
+        sentences = self._sentence_re.split(body_lower)
         
-        if not sentences or not words:
+        if not sentences or not word_count:
             return {'flesch_reading_ease': 0, 'avg_sentence_length': 0}
         
         # Calculate average sentence length
-        avg_sentence_length = len(words) / len(sentences)
+        avg_sentence_length = word_count / len(sentences)
         
         # Simple Flesch Reading Ease approximation
         # Higher score = easier to read
-        syllables = self._count_syllables(body)
-        flesch_score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * (syllables / len(words)))
+        syllables = self._count_syllables(body_lower)
+        flesch_score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * (syllables / word_count))
         flesch_score = max(0, min(100, flesch_score))  # Clamp between 0 and 100
         
         return {
@@ -174,55 +294,33 @@ class EmailCategorizer:
             'avg_sentence_length': round(avg_sentence_length, 2)
         }
     
-    def _count_syllables(self, text: str) -> int:
-        """Count syllables in text (approximation)."""
-        text = text.lower()
-        count = 0
-        vowels = "aeiouy"
-        on_vowel = False
-        
-        for char in text:
-            is_vowel = char in vowels
-            if is_vowel and not on_vowel:
-                count += 1
-            on_vowel = is_vowel
-        
-        return count
+    def _count_syllables(self, text_lower: str) -> int:
+        """Count syllables in lowercased text (approximation)."""
+        # One syllable per run of consecutive vowels, found in a single regex scan
+        return sum(1 for _ in self._vowel_group_re.finditer(text_lower))
     
-    def _extract_key_topics(self, body: str) -> List[str]:
-        """Extract key topics from email content."""
-        # Remove common words
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-            'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those',
-            'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her',
-            'us', 'them', 'my', 'your', 'his', 'her', 'its', 'our', 'their'
-        }
-        
-        words = re.findall(r'\b\w+\b', body.lower())
-        word_freq = {}
-        
-        for word in words:
-            if len(word) > 3 and word not in stop_words:
-                word_freq[word] = word_freq.get(word, 0) + 1
+    def _extract_key_topics(self, body_words: List[str]) -> List[str]:
+        """Extract key topics from the words of the lowercased email body."""
+        # Count words, skipping short and common ones
+        stop_words = self.STOP_WORDS
+        word_freq = Counter(
+            word for word in body_words
+            if len(word) > 3 and word not in stop_words
+        )
         
         # Return top 10 most frequent words
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, freq in sorted_words[:10]]
+        return [word for word, freq in word_freq.most_common(10)]
     
     def _extract_links(self, body: str) -> List[str]:
         """Extract links from email content."""
-        url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        return re.findall(url_pattern, body)
+        return self._url_re.findall(body)
     
     def _generate_content_hash(self, body: str) -> str:
         """Generate a hash of the email content for duplicate detection."""
-        return hashlib.md5(body.encode('utf-8')).hexdigest()
+        return hashlib.blake2b(body.encode('utf-8'), digest_size=16).hexdigest()
     
-    def is_duplicate_content(self, content_hash: str, existing_hashes: List[str]) -> bool:
-        """Check if content hash already exists (duplicate detection)."""
+    def is_duplicate_content(self, content_hash: str, existing_hashes: Collection[str]) -> bool:
+        """Check if content hash already exists (duplicate detection); pass a set for O(1) lookups."""
         return content_hash in existing_hashes
     
     def get_content_summary(self, email_data: Dict[str, Any], analysis: Dict[str, Any]) -> str:
@@ -241,12 +339,11 @@ class EmailCategorizer:
     def should_process_for_topics(self, email_data: Dict[str, Any], analysis: Dict[str, Any]) -> bool:
         """Determine if email should be processed for topic generation."""
         # Skip if too short
-        if analysis.get('word_count', 0) < 50:
+        if analysis.get('word_count', 0) < self.MIN_TOPIC_WORDS:
             return False
         
         # Skip if content type is not suitable
-        unsuitable_types = ['notification', 'promotional']
-        if analysis.get('content_type') in unsuitable_types:
+        if analysis.get('content_type') in self.UNSUITABLE_CONTENT_TYPES:
             return False
         
         # Skip if sentiment is negative (might be complaints, etc.)
@@ -262,7 +359,7 @@ class EmailCategorizer:
     
     def get_processing_priority(self, email_data: Dict[str, Any], analysis: Dict[str, Any]) -> int:
         """Calculate processing priority for the email (higher = more important)."""
-        priority = 0
+        priority: int = 0
         
         # Content type priority
         content_type_priority = {
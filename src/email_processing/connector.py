@@ -3,30 +3,204 @@ Gmail email connector for the Email Scanner system.
 Handles both IMAP connections and Gmail API with OAuth2 authentication.
 """
 
+import atexit
 import imaplib
 import email
+import json
+import os
+import re
 import ssl
+import threading
+import time
+import zlib
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 # Using built-in email module
 from email.mime.text import MIMEText
+from email.message import Message
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict, Any, Optional, Tuple
+from email.parser import BytesHeaderParser
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import logging
 from datetime import datetime, timedelta
 
 from src.config.config_manager import get_config
 from src.utils.logger import get_logger
 from src.email_processing.gmail_api_connector import GmailAPIConnector
+from src.email_processing.bodystructure import (
+    BodyPart, body_parts, decode_section, estimate_size, parse_fetch_response
+)
+
+# Idle IMAP connections kept open between connector uses, keyed by
+# (imap_server, username). A connection is checked out by connect() and
+# handed back by disconnect(), so no two connectors ever share one.
+_IMAP_POOL: Dict[Tuple[str, str], List[Tuple[imaplib.IMAP4_SSL, float]]] = {}
+_IMAP_POOL_LOCK = threading.Lock()
+_IMAP_POOL_SIZE = 8  # Idle connections kept per key
+_IMAP_MAX_IDLE = 25 * 60  # Gmail drops sessions idle for about 30 minutes
+
+
+def _close_pooled_connections():
+    """Log out of every idle pooled IMAP connection."""
+    with _IMAP_POOL_LOCK:
+        connections = [conn for idle in _IMAP_POOL.values() for conn, _ in idle]
+        _IMAP_POOL.clear()
+    
+    for conn in connections:
+        try:
+            conn.logout()
+        except Exception:
+            pass
+
+
+atexit.register(_close_pooled_connections)
+
+# UID attribute of a FETCH response line
+_UID_RE = re.compile(rb'\bUID (\d+)')
+
+# Serializes read-modify-write of the UID state file between folder workers
+_UID_STATE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def _decode_header_value(header: str) -> str:
+    """Decode an RFC 2047 encoded header value; cached since senders repeat."""
+    try:
+        # Handle encoded headers
+        decoded_parts = []
+        for part, encoding in email.header.decode_header(header):
+            if isinstance(part, bytes):
+                if encoding:
+                    decoded_parts.append(part.decode(encoding))
+                else:
+                    decoded_parts.append(part.decode('utf-8', errors='ignore'))
+            else:
+                decoded_parts.append(str(part))
+        
+        return "".join(decoded_parts)
+    except Exception:
+        return str(header)
+
+
+class _CompressedIMAP4_SSL(imaplib.IMAP4_SSL):
+    """IMAP4_SSL that can switch the stream to DEFLATE compression (RFC 4978)."""
+    
+    def __init__(self, *args, **kwargs):
+        self._compressor = None
+        self._decompressor = None
+        self._inbuf = bytearray()
+        super().__init__(*args, **kwargs)
+    
+    def enable_compression(self) -> bool:
+        """Negotiate COMPRESS=DEFLATE; False if the server doesn't offer it."""
+        # Servers often advertise COMPRESS only once authenticated
+        _, data = self.capability()
+        capabilities = (data[0] or b"").upper().split() if data else []
+        if b"COMPRESS=DEFLATE" not in capabilities:
+            return False
+        
+        typ, _ = self.xatom("COMPRESS", "DEFLATE")
+        if typ != "OK":
+            return False
+        
+        # Raw deflate streams, as RFC 4978 specifies
+        self._compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        self._decompressor = zlib.decompressobj(-15)
+        return True
+    
+    def send(self, data: bytes):
+        if self._compressor:
+            data = self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        super().send(data)
+    
+    def read(self, size: int) -> bytes:
+        if not self._decompressor:
+            return super().read(size)
+        
+        while len(self._inbuf) < size:
+            self._fill()
+        data = bytes(self._inbuf[:size])
+        del self._inbuf[:size]
+        return data
+    
+    def readline(self) -> bytes:
+        if not self._decompressor:
+            return super().readline()
+        
+        end = self._inbuf.find(b"\n")
+        while end < 0:
+            if len(self._inbuf) > imaplib._MAXLINE:
+                raise self.error(f"got more than {imaplib._MAXLINE} bytes")
+            self._fill()
+            end = self._inbuf.find(b"\n")
+        line = bytes(self._inbuf[:end + 1])
+        del self._inbuf[:end + 1]
+        return line
+    
+    def _fill(self):
+        """Decompress the next chunk from the socket into the input buffer."""
+        # read1 returns whatever is buffered first, including compressed
+        # bytes read ahead while the COMPRESS response was being read
+        compressed = self.file.read1(65536)
+        if not compressed:
+            raise self.abort("socket error: EOF")
+        self._inbuf += self._decompressor.decompress(compressed)
+
+
+class _LazyHeaders(Mapping):
+    """
+    Read-only mapping over a message's headers, so fetched records don't copy
+    every header into a dict up front.
+    
+    Lookups are case-insensitive like email.message.Message; a repeated header
+    resolves to its last occurrence, as it did in the dict this replaces.
+    """
+    
+    def __init__(self, message: Message):
+        self._message = message
+    
+    def __getitem__(self, name: str) -> str:
+        values = self._message.get_all(name)
+        if not values:
+            raise KeyError(name)
+        return values[-1]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(dict.fromkeys(self._message.keys()))
+    
+    def __len__(self) -> int:
+        return len(dict.fromkeys(self._message.keys()))
+    
+    def __repr__(self) -> str:
+        return f"_LazyHeaders({self.to_dict()!r})"
+    
+    def to_dict(self) -> Dict[str, str]:
+        """Copy the headers into a plain dictionary."""
+        return dict(self._message.items())
 
 
 class GmailConnector:
     """Gmail-specific email connector with OAuth2 support."""
     
+    # FETCH items for full messages and for header-only listings; PEEK leaves
+    # the \\Seen flag alone
+    FETCH_FULL = "(RFC822)"
+    FETCH_HEADERS = "(BODY.PEEK[HEADER])"
+    
+    # Gmail allows 15 simultaneous IMAP connections per account; leave room
+    # for the main connection and other clients
+    MAX_FOLDER_WORKERS = 8
+    
     def __init__(self):
         self.config = get_config()
         self.logger = get_logger("gmail_connector")
         self.imap_connection: Optional[imaplib.IMAP4_SSL] = None
         self.smtp_connection = None
         self.gmail_api = GmailAPIConnector() if self.config.email.use_gmail_api else None
+        # Watermarks of the last fetch per folder as (uidvalidity, last_uid),
+        # saved by commit_uid_watermark() once the fetched emails are handled
+        self._pending_watermarks: Dict[str, Tuple[Optional[str], int]] = {}
         
     def connect(self) -> bool:
         """Establish connection to Gmail (IMAP or API)."""
@@ -36,13 +210,19 @@ class GmailConnector:
             return self._connect_imap()
     
     def _connect_imap(self) -> bool:
-        """Establish connection to Gmail IMAP server."""
+        """Establish connection to Gmail IMAP server, reusing a pooled one if possible."""
+        pooled = self._take_pooled_connection()
+        if pooled:
+            self.imap_connection = pooled
+            self.logger.debug(f"Reusing pooled IMAP connection for {self.config.email.username}")
+            return True
+        
         try:
             # Create SSL context for secure connection
             ssl_context = ssl.create_default_context()
             
             # Connect to Gmail IMAP server
-            self.imap_connection = imaplib.IMAP4_SSL(
+            self.imap_connection = _CompressedIMAP4_SSL(
                 self.config.email.imap_server,
                 self.config.email.imap_port,
                 ssl_context=ssl_context
@@ -54,6 +234,13 @@ class GmailConnector:
                 self.config.email.password
             )
             
+            if self.config.email.imap_compression:
+                try:
+                    if self.imap_connection.enable_compression():
+                        self.logger.debug("IMAP COMPRESS=DEFLATE enabled")
+                except imaplib.IMAP4.error as e:
+                    self.logger.warning(f"Could not enable IMAP compression: {e}")
+            
             self.logger.info(f"Successfully connected to Gmail IMAP as {self.config.email.username}")
             return True
             
@@ -64,19 +251,54 @@ class GmailConnector:
             self.logger.error(f"IMAP connection failed: {e}")
             return False
     
+    def _pool_key(self) -> Tuple[str, str]:
+        """Key of this connector's account in the IMAP connection pool."""
+        return (self.config.email.imap_server, self.config.email.username)
+    
+    def _take_pooled_connection(self) -> Optional[imaplib.IMAP4_SSL]:
+        """Check out a live idle connection, logging out stale or broken ones."""
+        key = self._pool_key()
+        while True:
+            with _IMAP_POOL_LOCK:
+                idle = _IMAP_POOL.get(key)
+                if not idle:
+                    return None
+                connection, last_used = idle.pop()
+            
+            if time.monotonic() - last_used < _IMAP_MAX_IDLE:
+                try:
+                    connection.noop()
+                    return connection
+                except (imaplib.IMAP4.error, OSError) as e:
+                    self.logger.debug(f"Discarding broken pooled IMAP connection: {e}")
+            
+            try:
+                connection.logout()
+            except Exception:
+                pass
+    
     def disconnect(self):
-        """Close the connection (IMAP or API)."""
+        """Release the connection (IMAP or API)."""
         if self.config.email.use_gmail_api:
             # Gmail API doesn't require explicit disconnection
             self.logger.info("Gmail API connection closed")
         elif self.imap_connection:
+            connection, self.imap_connection = self.imap_connection, None
+            
+            # Keep the session open for the next connector; connect() checks
+            # it with NOOP before handing it out again
+            with _IMAP_POOL_LOCK:
+                idle = _IMAP_POOL.setdefault(self._pool_key(), [])
+                if len(idle) < _IMAP_POOL_SIZE:
+                    idle.append((connection, time.monotonic()))
+                    self.logger.info("IMAP connection returned to pool")
+                    return
+            
             try:
-                self.imap_connection.logout()
+                connection.logout()
                 self.logger.info("IMAP connection closed")
             except Exception as e:
                 self.logger.error(f"Error closing IMAP connection: {e}")
-            finally:
-                self.imap_connection = None
     
     def get_email_count(self, folder: str = "INBOX") -> int:
         """Get the number of emails in a folder."""
@@ -95,7 +317,8 @@ class GmailConnector:
                     folder: str = "INBOX", 
                     limit: int = 50, 
                     days_back: int = 7,
-                    unread_only: bool = False) -> List[Dict[str, Any]]:
+                    unread_only: bool = False,
+                    headers_only: bool = False) -> List[Dict[str, Any]]:
         """
         Fetch emails from Gmail with filtering options.
         
@@ -104,6 +327,7 @@ class GmailConnector:
             limit: Maximum number of emails to fetch
             days_back: Number of days back to search
             unread_only: Only fetch unread emails
+            headers_only: Only fetch headers (no body or attachments), for listings
             
         Returns:
             List of email dictionaries with metadata and content
@@ -113,16 +337,77 @@ class GmailConnector:
                 query=f"in:{folder.lower()}",
                 limit=limit,
                 days_back=days_back,
-                unread_only=unread_only
+                unread_only=unread_only,
+                headers_only=headers_only
             )
         else:
-            return self._fetch_emails_imap(folder, limit, days_back, unread_only)
+            return self._fetch_emails_imap(folder, limit, days_back, unread_only, headers_only)
+    
+    def fetch_emails_multi(self, 
+                           folders: List[str], 
+                           limit: int = 50, 
+                           days_back: int = 7,
+                           unread_only: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch emails from several folders concurrently.
+        
+        An IMAP connection (and a Gmail API service object) must not be shared
+        between threads, so every folder is fetched over its own connection.
+        
+        Args:
+            folders: Email folders to search
+            limit: Maximum number of emails to fetch per folder
+            days_back: Number of days back to search
+            unread_only: Only fetch unread emails
+            
+        Returns:
+            Dictionary mapping each folder to its list of email dictionaries
+        """
+        folders = list(dict.fromkeys(folders))
+        if not folders:
+            return {}
+        
+        workers = min(len(folders), self.MAX_FOLDER_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                folder: executor.submit(self._fetch_folder, folder, limit, days_back, unread_only)
+                for folder in folders
+            }
+        
+        return {folder: future.result() for folder, future in futures.items()}
+    
+    def _fetch_folder(self, 
+                      folder: str, 
+                      limit: int, 
+                      days_back: int, 
+                      unread_only: bool) -> List[Dict[str, Any]]:
+        """Fetch one folder over a dedicated connection (runs in a worker thread)."""
+        worker = GmailConnector()
+        
+        try:
+            if self.config.email.use_gmail_api:
+                worker.gmail_api = self.gmail_api.clone()
+            elif not worker.connect():
+                self.logger.error(f"Could not open a connection for folder {folder}")
+                return []
+            
+            emails = worker.fetch_emails(folder, limit, days_back, unread_only)
+            self._pending_watermarks.update(worker._pending_watermarks)
+            return emails
+            
+        except Exception as e:
+            self.logger.error(f"Error fetching folder {folder}: {e}")
+            return []
+        finally:
+            if not self.config.email.use_gmail_api:
+                worker.disconnect()
     
     def _fetch_emails_imap(self, 
                           folder: str = "INBOX", 
                           limit: int = 50, 
                           days_back: int = 7,
-                          unread_only: bool = False) -> List[Dict[str, Any]]:
+                          unread_only: bool = False,
+                          headers_only: bool = False) -> List[Dict[str, Any]]:
         """Fetch emails using IMAP."""
         emails = []
         
@@ -130,9 +415,20 @@ class GmailConnector:
             # Select the folder
             self.imap_connection.select(folder)
             
+            # Only fetch messages newer than the previous scan; header listings
+            # ignore the watermark so they still cover the whole date range
+            track_uids = self.config.email.incremental_fetch and not headers_only
+            last_uid = 0
+            if track_uids:
+                uidvalidity = self._get_uidvalidity()
+                last_uid = self._get_uid_watermark(folder, uidvalidity)
+            
             # Build search criteria
             search_criteria = []
             
+            if last_uid:
+                search_criteria.append(f"UID {last_uid + 1}:*")
+            
             if unread_only:
                 search_criteria.append("UNSEEN")
             
@@ -143,29 +439,37 @@ class GmailConnector:
             
             search_string = " ".join(search_criteria) if search_criteria else "ALL"
             
-            # Search for emails
-            _, message_numbers = self.imap_connection.search(None, search_string)
+            # Search for emails by UID, which unlike sequence numbers stays
+            # stable between sessions
+            _, message_uids = self.imap_connection.uid("SEARCH", None, search_string)
+            
+            email_list = message_uids[0].split() if message_uids[0] else []
+            if last_uid:
+                # "n:*" always matches the newest message, even below n
+                email_list = [uid for uid in email_list if int(uid) > last_uid]
             
-            if not message_numbers[0]:
+            if not email_list:
                 self.logger.info("No emails found matching criteria")
                 return emails
             
             # Get the most recent emails (limit)
-            email_list = message_numbers[0].split()
             if limit:
                 email_list = email_list[-limit:]  # Get the most recent emails
             
             self.logger.info(f"Found {len(email_list)} emails to process")
             
-            # Fetch each email
-            for num in email_list:
-                try:
-                    email_data = self._fetch_single_email(num)
-                    if email_data:
-                        emails.append(email_data)
-                except Exception as e:
-                    self.logger.error(f"Error fetching email {num}: {e}")
-                    continue
+            # Fetch in batches, one round trip per batch; small enough batches
+            # stay under the server's maximum command length
+            batch_size = max(1, self.config.email.fetch_batch_size)
+            for start in range(0, len(email_list), batch_size):
+                batch = email_list[start:start + batch_size]
+                if self.config.email.text_parts_only and not headers_only:
+                    emails.extend(self._fetch_text_parts_batch(batch))
+                else:
+                    emails.extend(self._fetch_email_batch(batch, headers_only))
+            
+            if track_uids:
+                self._stage_uid_watermark(folder, uidvalidity, last_uid, email_list, emails)
             
             return emails
             
@@ -173,34 +477,297 @@ class GmailConnector:
             self.logger.error(f"Error fetching emails: {e}")
             return emails
     
-    def _fetch_single_email(self, email_num: bytes) -> Optional[Dict[str, Any]]:
-        """Fetch a single email by its number."""
+    def _fetch_email_batch(self, 
+                           email_uids: List[bytes], 
+                           headers_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Fetch several emails with a single UID FETCH command.
+        
+        Args:
+            email_uids: Message UIDs from UID SEARCH
+            headers_only: Only fetch and parse the message headers
+            
+        Returns:
+            Parsed emails in the order of email_uids; messages missing from the
+            batch response are fetched one by one
+        """
+        email_bodies = {}
+        try:
+            message_parts = self.FETCH_HEADERS if headers_only else self.FETCH_FULL
+            _, msg_data = self.imap_connection.uid("FETCH", b",".join(email_uids), message_parts)
+            email_bodies = self._literals_by_uid(msg_data)
+        except Exception as e:
+            self.logger.warning(f"Batch fetch failed, fetching {len(email_uids)} emails one by one: {e}")
+        
+        emails = []
+        for uid in email_uids:
+            try:
+                email_body = email_bodies.get(uid)
+                if email_body is None:
+                    email_data = self._fetch_single_email(uid, headers_only)
+                else:
+                    email_data = self._parse_email(uid, email_body, headers_only)
+                if email_data:
+                    emails.append(email_data)
+            except Exception as e:
+                self.logger.error(f"Error fetching email {uid}: {e}")
+        
+        return emails
+    
+    @staticmethod
+    def _literals_by_uid(msg_data: List[Any]) -> Dict[bytes, bytes]:
+        """Map each UID in an imaplib FETCH response to the message literal that came with it."""
+        # Each message comes back as a (b'<seq> (UID <uid> <item> {size}', literal)
+        # tuple followed by b')'; servers may also send the UID after the literal
+        literals = {}
+        literal = None
+        for item in msg_data:
+            if isinstance(item, tuple):
+                response, literal = item
+            elif isinstance(item, bytes):
+                response = item
+            else:
+                continue
+            match = _UID_RE.search(response)
+            if match and literal is not None:
+                literals[match.group(1)] = literal
+                literal = None
+        return literals
+    
+    def _fetch_text_parts_batch(self, email_uids: List[bytes]) -> List[Dict[str, Any]]:
+        """
+        Fetch several emails' headers and text parts, leaving attachments on the server.
+        
+        BODYSTRUCTURE locates the text parts and describes the attachments; the
+        headers and text parts are then fetched with one command per part layout.
+        
+        Args:
+            email_uids: Message UIDs from UID SEARCH
+            
+        Returns:
+            Parsed emails in the order of email_uids; messages that can't be
+            fetched this way are fetched whole
+        """
+        emails_by_uid = {}
+        try:
+            _, msg_data = self.imap_connection.uid("FETCH", b",".join(email_uids), "(BODYSTRUCTURE)")
+            structures = parse_fetch_response(msg_data)
+            
+            # Group messages by the sections they need, e.g. ("1",) for most
+            # multipart/alternative mail
+            message_parts = {}
+            groups: Dict[Tuple[str, ...], List[bytes]] = {}
+            for uid in email_uids:
+                structure = structures.get(uid, {}).get(b'BODYSTRUCTURE')
+                if not isinstance(structure, list):
+                    continue
+                try:
+                    parts = body_parts(structure)
+                except (IndexError, TypeError, ValueError) as e:
+                    self.logger.debug(f"Unreadable BODYSTRUCTURE for email {uid}: {e}")
+                    continue
+                message_parts[uid] = parts
+                groups.setdefault(self._text_sections(parts), []).append(uid)
+            
+            for sections, group_uids in groups.items():
+                fetch_items = "(BODY.PEEK[HEADER]" + "".join(f" BODY.PEEK[{section}]" for section in sections) + ")"
+                _, msg_data = self.imap_connection.uid("FETCH", b",".join(group_uids), fetch_items)
+                for uid, fields in parse_fetch_response(msg_data).items():
+                    if uid in message_parts:
+                        email_data = self._build_text_email(uid, fields, message_parts[uid])
+                        if email_data:
+                            emails_by_uid[uid] = email_data
+        except Exception as e:
+            self.logger.warning(f"Text part fetch failed, fetching {len(email_uids)} emails whole: {e}")
+        
+        missing = [uid for uid in email_uids if uid not in emails_by_uid]
+        if missing:
+            for email_data in self._fetch_email_batch(missing):
+                emails_by_uid[email_data['uid'].encode()] = email_data
+        
+        return [emails_by_uid[uid] for uid in email_uids if uid in emails_by_uid]
+    
+    @staticmethod
+    def _text_sections(parts: List[BodyPart]) -> Tuple[str, ...]:
+        """Sections holding the body text: the text/plain parts, else the text/html ones."""
+        if not parts[0].content_type.startswith("multipart/"):
+            return ("TEXT",)
+        
+        inline = [part for part in parts[1:] if part.disposition != "attachment"]
+        plain = tuple(part.section for part in inline if part.content_type == "text/plain")
+        return plain or tuple(part.section for part in inline if part.content_type == "text/html")
+    
+    def _build_text_email(self, 
+                          email_uid: bytes, 
+                          fields: Dict[bytes, Any], 
+                          parts: List[BodyPart]) -> Optional[Dict[str, Any]]:
+        """Build an email dictionary from fetched headers, text sections and BODYSTRUCTURE."""
+        email_data = self._parse_email(email_uid, fields.get(b'BODY[HEADER]') or b"", headers_only=True)
+        if email_data is None:
+            return None
+        
+        def section_text(part: BodyPart) -> str:
+            data = decode_section(fields.get(f"BODY[{part.section}]".encode()), part.encoding)
+            return data.decode('utf-8', errors='ignore')
+        
+        if not parts[0].content_type.startswith("multipart/"):
+            email_data['body'] = section_text(parts[0]).strip()
+            email_data['attachments'] = []
+            return email_data
+        
+        # Same choice as _extract_parts: all text/plain parts, else the first
+        # non-empty text/html part
+        inline = [part for part in parts[1:] if part.disposition != "attachment"]
+        body = "".join(section_text(part) for part in inline if part.content_type == "text/plain")
+        if not body:
+            body = next(
+                (text for text in (section_text(part) for part in inline if part.content_type == "text/html") if text),
+                ""
+            )
+        
+        email_data['body'] = body.strip()
+        email_data['attachments'] = [
+            {
+                'filename': self._decode_header(part.filename),
+                'content_type': part.content_type,
+                'size': estimate_size(part.octets, part.encoding)
+            }
+            for part in parts
+            if part.disposition == "attachment" and part.filename
+        ]
+        return email_data
+    
+    def _fetch_single_email(self, email_uid: bytes, headers_only: bool = False) -> Optional[Dict[str, Any]]:
+        """Fetch a single email by its UID."""
         try:
             # Fetch the email
-            _, msg_data = self.imap_connection.fetch(email_num, "(RFC822)")
-            email_body = msg_data[0][1]
+            message_parts = self.FETCH_HEADERS if headers_only else self.FETCH_FULL
+            _, msg_data = self.imap_connection.uid("FETCH", email_uid, message_parts)
+            return self._parse_email(email_uid, msg_data[0][1], headers_only)
             
-            # Parse the email
-            email_message = email.message_from_bytes(email_body)
+        except Exception as e:
+            self.logger.error(f"Error fetching email {email_uid}: {e}")
+            return None
+    
+    def _get_uidvalidity(self) -> Optional[str]:
+        """UIDVALIDITY of the selected folder, as reported by SELECT."""
+        _, data = self.imap_connection.response("UIDVALIDITY")
+        return data[0].decode() if data and data[0] else None
+    
+    def _uid_state_key(self, folder: str) -> str:
+        """Key of a folder's watermark in the UID state file."""
+        return f"{self.config.email.username}:{folder}"
+    
+    def _load_uid_state(self) -> Dict[str, Any]:
+        """Read the saved UID watermarks; empty if there are none yet."""
+        try:
+            with open(self.config.email.uid_state_file, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+    
+    def _get_uid_watermark(self, folder: str, uidvalidity: Optional[str]) -> int:
+        """Highest UID fetched from a folder by a previous scan, or 0 if none."""
+        with _UID_STATE_LOCK:
+            entry = self._load_uid_state().get(self._uid_state_key(folder))
+        
+        # UIDs are only comparable while the folder's UIDVALIDITY is unchanged
+        if not entry or entry.get('uidvalidity') != uidvalidity:
+            return 0
+        return entry.get('last_uid', 0)
+    
+    def _stage_uid_watermark(self, 
+                             folder: str, 
+                             uidvalidity: Optional[str], 
+                             last_uid: int, 
+                             email_uids: List[bytes], 
+                             emails: List[Dict[str, Any]]):
+        """
+        Remember how far a fetch got, for commit_uid_watermark() to save.
+        
+        Args:
+            folder: Folder the emails were fetched from
+            uidvalidity: UIDVALIDITY of the folder
+            last_uid: Watermark the fetch started from
+            email_uids: UIDs the fetch asked for, in ascending order
+            emails: Emails that were fetched and parsed
+        """
+        # Stop below the first message that failed, so the next scan retries it
+        parsed = {email_data['uid'] for email_data in emails}
+        for uid in email_uids:
+            if uid.decode() not in parsed:
+                break
+            last_uid = int(uid)
+        
+        if last_uid:
+            self._pending_watermarks[folder] = (uidvalidity, last_uid)
+    
+    def commit_uid_watermark(self):
+        """
+        Save the watermarks of this connector's fetches, so later scans skip those emails.
+        
+        Call once the fetched emails have been fully processed; if processing
+        fails, leaving the watermark unsaved makes the next scan fetch them again.
+        """
+        pending, self._pending_watermarks = self._pending_watermarks, {}
+        for folder, (uidvalidity, last_uid) in pending.items():
+            self._save_uid_watermark(folder, uidvalidity, last_uid)
+    
+    def _save_uid_watermark(self, folder: str, uidvalidity: Optional[str], last_uid: int):
+        """Record the highest UID fetched from a folder."""
+        path = self.config.email.uid_state_file
+        with _UID_STATE_LOCK:
+            state = self._load_uid_state()
+            state[self._uid_state_key(folder)] = {'uidvalidity': uidvalidity, 'last_uid': last_uid}
+            
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                
+                # Write atomically so an interrupted save keeps the old state
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as file:
+                    json.dump(state, file)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                self.logger.warning(f"Could not save UID state to {path}: {e}")
+    
+    def _parse_email(self, 
+                     email_uid: bytes, 
+                     email_body: bytes, 
+                     headers_only: bool = False) -> Optional[Dict[str, Any]]:
+        """Parse a fetched RFC822 message (or just its header block) into an email dictionary."""
+        try:
+            # Parse the email; the header parser stops at the blank line
+            # instead of building the MIME tree
+            if headers_only:
+                email_message = BytesHeaderParser().parsebytes(email_body)
+            else:
+                email_message = email.message_from_bytes(email_body)
             
             # Extract email data
             email_data = {
-                'uid': email_num.decode(),
+                'uid': email_uid.decode(),
                 'subject': self._decode_header(email_message.get('Subject', '')),
                 'from': self._decode_header(email_message.get('From', '')),
                 'to': self._decode_header(email_message.get('To', '')),
                 'date': email_message.get('Date', ''),
                 'message_id': email_message.get('Message-ID', ''),
                 'content_type': email_message.get_content_type(),
-                'body': self._extract_body(email_message),
-                'headers': dict(email_message.items()),
-                'attachments': self._extract_attachments(email_message)
+                'headers': _LazyHeaders(email_message)
             }
             
+            if not headers_only:
+                email_data['body'], email_data['attachments'] = self._extract_parts(email_message)
+                # The headers view keeps the message alive; drop the parsed
+                # MIME parts so only the header list is retained
+                email_message.set_payload(None)
+            
             return email_data
             
         except Exception as e:
-            self.logger.error(f"Error parsing email {email_num}: {e}")
+            self.logger.error(f"Error parsing email {email_uid}: {e}")
             return None
     
     def _decode_header(self, header: str) -> str:
@@ -208,76 +775,83 @@ class GmailConnector:
         if not header:
             return ""
         
-        try:
-            # Handle encoded headers
-            decoded_parts = email.header.decode_header(header)
-            decoded_string = ""
-            
-            for part, encoding in decoded_parts:
-                if isinstance(part, bytes):
-                    if encoding:
-                        decoded_string += part.decode(encoding)
-                    else:
-                        decoded_string += part.decode('utf-8', errors='ignore')
-                else:
-                    decoded_string += str(part)
-            
-            return decoded_string
-        except Exception:
-            return str(header)
+        if not isinstance(header, str):
+            # Header objects (raw 8-bit values) are unhashable, so skip the cache
+            return _decode_header_value.__wrapped__(header)
+        
+        # Plain ASCII without encoded words decodes to itself
+        if header.isascii() and "=?" not in header:
+            return header
+        
+        return _decode_header_value(header)
     
-    def _extract_body(self, email_message) -> str:
-        """Extract the text body from an email message."""
-        body = ""
+    def _extract_parts(self, email_message) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Extract the text body and attachment information in one pass over the MIME tree.
         
-        if email_message.is_multipart():
-            for part in email_message.walk():
-                content_type = part.get_content_type()
-                content_disposition = str(part.get("Content-Disposition"))
-                
-                # Skip attachments
-                if "attachment" in content_disposition:
-                    continue
-                
-                # Get text content
-                if content_type == "text/plain":
-                    try:
-                        body += part.get_payload(decode=True).decode('utf-8', errors='ignore')
-                    except Exception:
-                        body += part.get_payload(decode=True).decode('latin-1', errors='ignore')
-                elif content_type == "text/html" and not body:
-                    # Use HTML if no plain text available
-                    try:
-                        body += part.get_payload(decode=True).decode('utf-8', errors='ignore')
-                    except Exception:
-                        body += part.get_payload(decode=True).decode('latin-1', errors='ignore')
-        else:
+        Args:
+            email_message: Parsed email message
+            
+        Returns:
+            Tuple of (body, attachments); the body joins the text/plain parts and
+            falls back to the first text/html part when there are none
+        """
+        if not email_message.is_multipart():
             # Not multipart
-            try:
-                body = email_message.get_payload(decode=True).decode('utf-8', errors='ignore')
-            except Exception:
-                body = email_message.get_payload(decode=True).decode('latin-1', errors='ignore')
+            payload = email_message.get_payload(decode=True) or b""
+            return payload.decode('utf-8', errors='ignore').strip(), []
         
-        return body.strip()
-    
-    def _extract_attachments(self, email_message) -> List[Dict[str, Any]]:
-        """Extract attachment information from email."""
+        plain_parts = []
+        html_body = ""
         attachments = []
         
-        if email_message.is_multipart():
-            for part in email_message.walk():
-                content_disposition = str(part.get("Content-Disposition"))
-                
-                if "attachment" in content_disposition:
-                    filename = part.get_filename()
-                    if filename:
-                        attachments.append({
-                            'filename': self._decode_header(filename),
-                            'content_type': part.get_content_type(),
-                            'size': len(part.get_payload(decode=True)) if part.get_payload(decode=True) else 0
-                        })
+        for part in email_message.walk():
+            if part.get_content_disposition() == "attachment":
+                filename = part.get_filename()
+                if filename:
+                    attachments.append({
+                        'filename': self._decode_header(filename),
+                        'content_type': part.get_content_type(),
+                        'size': self._payload_size(part)
+                    })
+                continue
+            
+            # Get text content
+            content_type = part.get_content_type()
+            if content_type == "text/plain":
+                payload = part.get_payload(decode=True)
+                if payload:
+                    plain_parts.append(payload.decode('utf-8', errors='ignore'))
+            elif content_type == "text/html" and not html_body:
+                payload = part.get_payload(decode=True)
+                if payload:
+                    html_body = payload.decode('utf-8', errors='ignore')
+        
+        body = "".join(plain_parts) or html_body
+        return body.strip(), attachments
+    
+    @staticmethod
+    def _payload_size(part: Message) -> int:
+        """Decoded size of a part's payload, computed without decoding base64 data."""
+        if part.is_multipart():
+            return 0
+        
+        encoding = str(part.get('Content-Transfer-Encoding', '')).strip().lower()
+        if encoding == 'base64':
+            payload = part.get_payload()
+            # Every 4 characters carry 3 bytes; line breaks carry none and
+            # each trailing '=' pads one byte
+            chars = len(payload) - payload.count('\n') - payload.count('\r')
+            tail = payload[-8:].rstrip()
+            padding = len(tail) - len(tail.rstrip('='))
+            return max(chars * 3 // 4 - padding, 0)
+        if encoding == '7bit':
+            return len(part.get_payload())
         
-        return attachments
+        # Quoted-printable, 8bit and the like are text and small; decode for
+        # the exact size
+        payload = part.get_payload(decode=True)
+        return len(payload) if payload else 0
     
     def mark_as_read(self, email_uids: List[str], folder: str = "INBOX") -> bool:
         """Mark emails as read."""
@@ -288,7 +862,7 @@ class GmailConnector:
                 self.imap_connection.select(folder)
                 
                 for uid in email_uids:
-                    self.imap_connection.store(uid, '+FLAGS', '\\Seen')
+                    self.imap_connection.uid("STORE", uid, '+FLAGS', '\\Seen')
                 
                 self.logger.info(f"Marked {len(email_uids)} emails as read")
                 return True
@@ -306,7 +880,7 @@ class GmailConnector:
                 self.imap_connection.select(source_folder)
                 
                 for uid in email_uids:
-                    self.imap_connection.store(uid, '+X-GM-LABELS', target_folder)
+                    self.imap_connection.uid("STORE", uid, '+X-GM-LABELS', target_folder)
                 
                 self.logger.info(f"Moved {len(email_uids)} emails to {target_folder}")
                 return True
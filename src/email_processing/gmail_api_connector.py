@@ -26,6 +26,9 @@ from src.utils.logger import get_logger
 class GmailAPIConnector:
     """Gmail API connector with OAuth2 support for reading and sending emails."""
     
+    # Headers requested for headers-only listings
+    METADATA_HEADERS = ['Subject', 'From', 'To', 'Date', 'Message-ID']
+    
     # Gmail API scopes
     SCOPES = [
         'https://www.googleapis.com/auth/gmail.readonly',
@@ -77,6 +80,19 @@ class GmailAPIConnector:
             self.logger.error(f"Authentication failed: {e}")
             return False
     
+    def clone(self) -> 'GmailAPIConnector':
+        """
+        Create a connector that shares these credentials but owns its service.
+        
+        The HTTP transport behind a service object is not thread-safe, so each
+        worker thread needs a clone of its own.
+        """
+        other = GmailAPIConnector()
+        other.credentials = self.credentials
+        if self.credentials:
+            other.service = build('gmail', 'v1', credentials=self.credentials)
+        return other
+    
     def test_connection(self) -> bool:
         """Test the Gmail API connection and authentication."""
         try:
@@ -97,7 +113,8 @@ class GmailAPIConnector:
                     query: str = "in:inbox",
                     limit: int = 50,
                     days_back: int = 7,
-                    unread_only: bool = False) -> List[Dict[str, Any]]:
+                    unread_only: bool = False,
+                    headers_only: bool = False) -> List[Dict[str, Any]]:
         """
         Fetch emails from Gmail using the API.
         
@@ -106,6 +123,7 @@ class GmailAPIConnector:
             limit: Maximum number of emails to fetch
             days_back: Number of days back to search
             unread_only: Only fetch unread emails
+            headers_only: Only fetch headers (no body or attachments), for listings
             
         Returns:
             List of email dictionaries with metadata and content
@@ -147,7 +165,7 @@ class GmailAPIConnector:
             # Fetch each email
             for message in messages:
                 try:
-                    email_data = self._fetch_single_email(message['id'])
+                    email_data = self._fetch_single_email(message['id'], headers_only)
                     if email_data:
                         emails.append(email_data)
                 except Exception as e:
@@ -160,15 +178,24 @@ class GmailAPIConnector:
             self.logger.error(f"Error fetching emails: {e}")
             return emails
     
-    def _fetch_single_email(self, message_id: str) -> Optional[Dict[str, Any]]:
+    def _fetch_single_email(self, message_id: str, headers_only: bool = False) -> Optional[Dict[str, Any]]:
         """Fetch a single email by its ID."""
         try:
-            # Get the full message
-            message = self.service.users().messages().get(
-                userId='me',
-                id=message_id,
-                format='full'
-            ).execute()
+            if headers_only:
+                # Metadata format returns just the requested headers, no payload
+                message = self.service.users().messages().get(
+                    userId='me',
+                    id=message_id,
+                    format='metadata',
+                    metadataHeaders=self.METADATA_HEADERS
+                ).execute()
+            else:
+                # Get the full message
+                message = self.service.users().messages().get(
+                    userId='me',
+                    id=message_id,
+                    format='full'
+                ).execute()
             
             # Extract headers
             headers = message['payload']['headers']
@@ -178,12 +205,6 @@ class GmailAPIConnector:
             date = next((h['value'] for h in headers if h['name'] == 'Date'), '')
             message_id_header = next((h['value'] for h in headers if h['name'] == 'Message-ID'), '')
             
-            # Extract body
-            body = self._extract_body_from_payload(message['payload'])
-            
-            # Extract attachments
-            attachments = self._extract_attachments_from_payload(message['payload'])
-            
             email_data = {
                 'id': message_id,
                 'thread_id': message.get('threadId', ''),
@@ -192,12 +213,14 @@ class GmailAPIConnector:
                 'to': recipient,
                 'date': date,
                 'message_id': message_id_header,
-                'body': body,
                 'headers': {h['name']: h['value'] for h in headers},
-                'attachments': attachments,
                 'labels': message.get('labelIds', [])
             }
             
+            if not headers_only:
+                email_data['body'] = self._extract_body_from_payload(message['payload'])
+                email_data['attachments'] = self._extract_attachments_from_payload(message['payload'])
+            
             return email_data
             
         except Exception as e:
@@ -4,6 +4,7 @@ Handles email scanning and processing tasks.
 """
 
 import time
+from itertools import islice
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
@@ -11,7 +12,7 @@ from src.email_processing.connector import GmailConnector
 from src.email_processing.filter import EmailFilter
 from src.email_processing.categorizer import EmailCategorizer
 from src.email_processing.sender import EmailSender
-from src.ai.topic_generator import TopicGenerator
+from src.ai.topic_generator import TopicGenerator, source_email_count, source_email_rows
 from src.ai.content_analyzer import ContentAnalyzer
 from src.config.config_manager import get_config
 from src.utils.logger import get_logger
@@ -35,7 +36,6 @@ def run_email_scan() -> bool:
         filter_engine = EmailFilter()
         categorizer = EmailCategorizer()
         content_analyzer = ContentAnalyzer()
-        topic_generator = TopicGenerator()
         email_sender = EmailSender()
         
         # Connect to Gmail
@@ -43,6 +43,9 @@ def run_email_scan() -> bool:
             logger.error("Failed to connect to Gmail")
             return False
         
+        # Opens pooled HTTP clients, closed in the finally below
+        topic_generator = TopicGenerator()
+        
         try:
             # Fetch emails
             emails = connector.fetch_emails(
@@ -66,21 +69,25 @@ def run_email_scan() -> bool:
             logger.info(f"Email categorization complete: {stats}")
             
             # Process emails for topic generation
+            candidate_emails = [
+                email_result['email_data']
+                for category, email_list in categorized_emails.items()
+                if category in ['tech', 'newsletter', 'professional']
+                for email_result in email_list
+            ]
+            
+            # Analyze email content in one batch (large batches run in parallel)
+            analyses = content_analyzer.analyze_many(candidate_emails)
+            
             processed_emails = []
-            for category, email_list in categorized_emails.items():
-                if category in ['tech', 'newsletter', 'professional']:
-                    for email_result in email_list:
-                        email_data = email_result['email_data']
-                        
-                        # Analyze email content
-                        analysis = content_analyzer.analyze_email_content(email_data)
-                        
-                        # Check if email should be processed for topics
-                        if content_analyzer.should_process_for_topics(email_data, analysis):
-                            report = content_analyzer.create_email_report(email_data, analysis)
-                            processed_emails.append(report)
-                            
-                            logger.info(f"Email ready for topic generation: {report['subject']}")
+            analyzed_at = datetime.now().isoformat()
+            for email_data, analysis in zip(candidate_emails, analyses):
+                # Check if email should be processed for topics
+                if content_analyzer.should_process_for_topics(email_data, analysis):
+                    report = content_analyzer.create_email_report(email_data, analysis, analyzed_at)
+                    processed_emails.append(report)
+                    
+                    logger.info(f"Email ready for topic generation: {report['subject']}")
             
             logger.info(f"Processed {len(processed_emails)} emails for topic generation")
             
@@ -98,16 +105,23 @@ def run_email_scan() -> bool:
                         if success:
                             logger.info("Topics email sent successfully")
                         else:
+                            # Keep the watermark so the next scan fetches these emails again
                             logger.error("Failed to send topics email")
+                            return True
                 else:
                     logger.info("No topics generated")
             else:
                 logger.info("No emails suitable for topic generation")
             
+            # Only now skip these emails in later scans; a scan that fails
+            # before this point fetches them again
+            connector.commit_uid_watermark()
+            
             return True
             
         finally:
             connector.disconnect()
+            topic_generator.close()
             
     except Exception as e:
         logger.error(f"Error during email scan: {e}")
@@ -334,7 +348,8 @@ def format_topics_as_html(topics: List[Dict[str, Any]], source_emails: List[Dict
                         </p>
                 """
                 
-                for source_email in topic['source_emails'][:3]:  # Show first 3 emails
+                source_count = source_email_count(topic['source_emails'])
+                for source_email in islice(source_email_rows(topic['source_emails']), 3):  # Show first 3 emails
                     try:
                         from email.utils import parsedate_to_datetime
                         parsed_date = parsedate_to_datetime(source_email.get('date', ''))
@@ -355,10 +370,10 @@ def format_topics_as_html(topics: List[Dict[str, Any]], source_emails: List[Dict
                         </div>
                     """
                 
-                if len(topic['source_emails']) > 3:
+                if source_count > 3:
                     source_emails_info += f"""
                         <p style="color: #999; font-size: 11px; margin-top: 5px;">
-                            + {len(topic['source_emails']) - 3} more emails
+                            + {source_count - 3} more emails
                         </p>
                     """
                 
@@ -7,7 +7,7 @@ import logging
 import logging.handlers
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Set
 from datetime import datetime
 
 from ..config.config_manager import get_config
@@ -86,7 +86,8 @@ def setup_logger(
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Convert max_size to bytes
-        size_map = {'B': 1, 'KB': 1024, 'MB': 1024**2, 'GB': 1024**3}
+        # Longest suffixes first, so "10MB" isn't read as "10M" bytes
+        size_map = {'GB': 1024**3, 'MB': 1024**2, 'KB': 1024, 'B': 1}
         size_str = max_size.upper().replace(' ', '')
         for unit, multiplier in size_map.items():
             if size_str.endswith(unit):
@@ -108,19 +109,40 @@ def setup_logger(
     return logger
 
 
+# Loggers built from the loaded config, returned as-is on later calls
+_CONFIGURED_LOGGERS: Dict[str, logging.Logger] = {}
+# Loggers that had to fall back to the defaults; rebuilt once the config loads
+_FALLBACK_LOGGERS: Set[str] = set()
+
+
 def get_logger(name: str = "email_scanner") -> logging.Logger:
     """
     Get a logger instance with configuration from config file.
     
+    Configured loggers are cached per name, so the config is only read the
+    first time a name is requested. A logger created before the config could
+    be loaded is set up again on the next call that can load it.
+    
     Args:
         name: Logger name
     
     Returns:
         Configured logger instance
     """
+    logger = _CONFIGURED_LOGGERS.get(name)
+    if logger is not None:
+        return logger
+    
+    if name in _FALLBACK_LOGGERS:
+        # Drop the default handlers, or setup_logger would keep them
+        fallback = logging.getLogger(name)
+        for handler in list(fallback.handlers):
+            fallback.removeHandler(handler)
+            handler.close()
+    
     try:
         config = get_config()
-        return setup_logger(
+        logger = setup_logger(
             name=name,
             log_file=config.logging.file,
             level=config.logging.level,
@@ -129,8 +151,14 @@ def get_logger(name: str = "email_scanner") -> logging.Logger:
         )
     except Exception as e:
         # Fallback to basic logger if config fails
-        print(f"Warning: Could not load logging config: {e}")
+        if name not in _FALLBACK_LOGGERS:
+            print(f"Warning: Could not load logging config: {e}")
+            _FALLBACK_LOGGERS.add(name)
         return setup_logger(name=name)
+    
+    _FALLBACK_LOGGERS.discard(name)
+    _CONFIGURED_LOGGERS[name] = logger
+    return logger
 
 
 class LoggerMixin:
@@ -183,18 +211,21 @@ def log_execution_time(func):
     return wrapper
 
 
-# Global logger instance
-logger = get_logger()
+def __getattr__(name: str):
+    # The global logger instance is created on first use, not at import time
+    if name == 'logger':
+        return get_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def log_email_scan_start(email_count: int):
     """Log the start of an email scanning session."""
-    logger.info(f"Starting email scan for {email_count} emails")
+    get_logger().info(f"Starting email scan for {email_count} emails")
 
 
 def log_email_scan_complete(processed_count: int, categorized_count: int, topics_generated: int):
     """Log the completion of an email scanning session."""
-    logger.info(
+    get_logger().info(
         f"Email scan completed: {processed_count} processed, "
         f"{categorized_count} categorized, {topics_generated} topics generated"
     )
@@ -202,29 +233,29 @@ def log_email_scan_complete(processed_count: int, categorized_count: int, topics
 
 def log_email_categorization(email_id: str, category: str, confidence: float):
     """Log email categorization results."""
-    logger.debug(f"Email {email_id} categorized as {category} (confidence: {confidence:.2f})")
+    get_logger().debug(f"Email {email_id} categorized as {category} (confidence: {confidence:.2f})")
 
 
 def log_topic_generation(content_length: int, topics_generated: int):
     """Log topic generation results."""
-    logger.info(f"Generated {topics_generated} topics from {content_length} characters of content")
+    get_logger().info(f"Generated {topics_generated} topics from {content_length} characters of content")
 
 
 def log_error(error: Exception, context: str = ""):
     """Log an error with context."""
-    logger.error(f"Error in {context}: {error}", exc_info=True)
+    get_logger().error(f"Error in {context}: {error}", exc_info=True)
 
 
 def log_warning(message: str, context: str = ""):
     """Log a warning with context."""
-    logger.warning(f"Warning in {context}: {message}")
+    get_logger().warning(f"Warning in {context}: {message}")
 
 
 def log_info(message: str, context: str = ""):
     """Log an info message with context."""
-    logger.info(f"Info in {context}: {message}")
+    get_logger().info(f"Info in {context}: {message}")
 
 
 def log_debug(message: str, context: str = ""):
     """Log a debug message with context."""
-    logger.debug(f"Debug in {context}: {message}") 
\ No newline at end of file
+    get_logger().debug(f"Debug in {context}: {message}") 
\ No newline at end of file
@@ -7,8 +7,8 @@ import sys
 import os
 from pathlib import Path
 
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
 
 from src.email_processing.sender import EmailSender
 from src.ai.topic_generator import TopicGenerator
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Self-check for IMAP COMPRESS=DEFLATE support.
+Runs the connector's compressed IMAP client against a scripted server over a
+local socket pair; needs no network access or credentials.
+"""
+
+import socket
+import sys
+import threading
+import zlib
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.email_processing.connector import _CompressedIMAP4_SSL
+
+
+# Messages served by UID FETCH; long enough to span several chunks, with CRLF
+# pairs and a ")" right where a chunk boundary may fall
+MESSAGES = {
+    uid: (
+        f"Subject: Message {uid}\r\nFrom: sender{uid}@example.com\r\n\r\n".encode()
+        + b"".join(b"line %d of message %d)\r\n" % (line, uid) for line in range(200))
+    )
+    for uid in (101, 102, 103)
+}
+
+# Plaintext bytes per sync-flushed DEFLATE block, and compressed bytes per
+# socket write; odd sizes so blocks split lines, CRLF pairs and literals
+BLOCK_SIZE = 37
+WRITE_SIZE = 5
+
+
+class ScriptedServer:
+    """Minimal IMAP server that compresses its output in small sync-flushed blocks."""
+    
+    def __init__(self, sock: socket.socket, offer_compression: bool):
+        self.sock = sock
+        self.offer_compression = offer_compression
+        self.compressor = None
+        self.decompressor = None
+        self.buffer = b""
+        self.compressed_bytes = 0
+    
+    def send(self, data: bytes):
+        if not self.compressor:
+            self.sock.sendall(data)
+            return
+        for start in range(0, len(data), BLOCK_SIZE):
+            block = self.compressor.compress(data[start:start + BLOCK_SIZE])
+            block += self.compressor.flush(zlib.Z_SYNC_FLUSH)
+            self.compressed_bytes += len(block)
+            for offset in range(0, len(block), WRITE_SIZE):
+                self.sock.sendall(block[offset:offset + WRITE_SIZE])
+    
+    def readline(self) -> bytes:
+        while b"\r\n" not in self.buffer:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                return b""
+            self.buffer += self.decompressor.decompress(chunk) if self.decompressor else chunk
+        line, self.buffer = self.buffer.split(b"\r\n", 1)
+        return line
+    
+    def serve(self):
+        self.send(b"* OK [CAPABILITY IMAP4rev1] ready\r\n")
+        authenticated = False
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            tag, command, *rest = line.decode().split(" ", 2)
+            command = command.upper()
+            
+            if command == "CAPABILITY":
+                capabilities = "IMAP4rev1"
+                if authenticated and self.offer_compression:
+                    capabilities += " COMPRESS=DEFLATE"
+                self.send(f"* CAPABILITY {capabilities}\r\n{tag} OK done\r\n".encode())
+            elif command == "LOGIN":
+                authenticated = True
+                self.send(f"{tag} OK logged in\r\n".encode())
+            elif command == "COMPRESS":
+                self.send(f"{tag} OK DEFLATE active\r\n".encode())
+                self.compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+                self.decompressor = zlib.decompressobj(-15)
+                self.buffer = self.decompressor.decompress(self.buffer)
+            elif command == "SELECT":
+                self.send(f"* {len(MESSAGES)} EXISTS\r\n* OK [UIDVALIDITY 7] ok\r\n{tag} OK [READ-WRITE] done\r\n".encode())
+            elif command == "UID" and rest[0].upper().startswith("SEARCH"):
+                uids = " ".join(str(uid) for uid in MESSAGES)
+                self.send(f"* SEARCH {uids}\r\n{tag} OK done\r\n".encode())
+            elif command == "UID":
+                response = b""
+                for number, (uid, message) in enumerate(MESSAGES.items(), 1):
+                    response += b"* %d FETCH (UID %d RFC822 {%d}\r\n%s FLAGS (\\Seen))\r\n" % (
+                        number, uid, len(message), message
+                    )
+                self.send(response + f"{tag} OK done\r\n".encode())
+            elif command == "LOGOUT":
+                try:
+                    self.send(f"* BYE\r\n{tag} OK bye\r\n".encode())
+                except OSError:
+                    pass  # imaplib closes the socket as soon as it reads BYE
+                return
+            else:
+                self.send(f"{tag} BAD unknown command\r\n".encode())
+
+
+def run_session(offer_compression: bool):
+    """Log in, try to enable compression, search and fetch; returns what the client saw."""
+    client_sock, server_sock = socket.socketpair()
+    server = ScriptedServer(server_sock, offer_compression)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    
+    class SocketPairIMAP(_CompressedIMAP4_SSL):
+        """The connector's client, speaking over the socket pair instead of TLS."""
+        
+        def open(self, host="", port=0, timeout=None):
+            self.host, self.port = host, port
+            self.sock = client_sock
+            self.file = client_sock.makefile("rb")
+    
+    try:
+        client = SocketPairIMAP()
+        client.login("user", "password")
+        compressed = client.enable_compression()
+        client.select("INBOX")
+        _, search_data = client.uid("SEARCH", None, "ALL")
+        _, fetch_data = client.uid("FETCH", "101:103", "(RFC822)")
+        client.logout()
+    finally:
+        client_sock.close()
+        thread.join(5)
+        server_sock.close()
+    
+    literals = [item[1] for item in fetch_data if isinstance(item, tuple)]
+    return compressed, search_data[0].split(), literals, server.compressed_bytes
+
+
+def test_compressed_session():
+    """Responses split across sync-flushed DEFLATE blocks decode intact."""
+    compressed, uids, literals, compressed_bytes = run_session(offer_compression=True)
+    assert compressed, "COMPRESS=DEFLATE was not enabled"
+    assert compressed_bytes > 0, "server never sent compressed data"
+    assert uids == [b"101", b"102", b"103"], uids
+    assert literals == list(MESSAGES.values()), "fetched messages differ from the originals"
+
+
+def test_uncompressed_session():
+    """Without COMPRESS=DEFLATE on offer the client stays uncompressed."""
+    compressed, uids, literals, compressed_bytes = run_session(offer_compression=False)
+    assert not compressed and compressed_bytes == 0
+    assert uids == [b"101", b"102", b"103"], uids
+    assert literals == list(MESSAGES.values()), "fetched messages differ from the originals"
+
+
+def main():
+    """Run all compression checks."""
+    print("🚀 Checking IMAP COMPRESS=DEFLATE support")
+    print("=" * 50)
+    
+    checks = [test_compressed_session, test_uncompressed_session]
+    failed = 0
+    for check in checks:
+        try:
+            check()
+            print(f"✅ {check.__doc__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {check.__doc__}: {e!r}")
+    
+    print("=" * 50)
+    if failed:
+        print(f"⚠️  {failed} of {len(checks)} checks failed")
+        return False
+    print(f"🎉 All {len(checks)} checks passed")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Self-check for the IMAP FETCH response parser.
+Replays canned Gmail FETCH responses through src/email_processing/bodystructure.py;
+needs no network access or credentials.
+"""
+
+import base64
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.email_processing.bodystructure import (
+    body_parts, decode_section, estimate_size, parse_fetch_response
+)
+
+
+# Responses in the shape imaplib's uid("FETCH", ...) returns them: plain lines
+# as bytes, and (line, literal) tuples where a line ends in {size}
+NESTED_MULTIPART = [
+    b'1 (UID 101 BODYSTRUCTURE ((("TEXT" "PLAIN" ("CHARSET" "UTF-8") NIL NIL "QUOTED-PRINTABLE" 120 4 NIL NIL NIL NIL)'
+    b'("TEXT" "HTML" ("CHARSET" "UTF-8") NIL NIL "QUOTED-PRINTABLE" 900 18 NIL NIL NIL NIL) "ALTERNATIVE" '
+    b'("BOUNDARY" "0000alt") NIL NIL NIL)("APPLICATION" "PDF" ("NAME" "report.pdf") NIL NIL "BASE64" 78000 NIL '
+    b'("ATTACHMENT" ("FILENAME" "report.pdf")) NIL NIL) "MIXED" ("BOUNDARY" "0000mixed") NIL NIL NIL))'
+]
+
+LITERAL_FILENAME = [
+    (
+        b'2 (UID 102 BODYSTRUCTURE (("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "7BIT" 10 1 NIL NIL NIL NIL)'
+        b'("IMAGE" "PNG" ("NAME" "photo.png") NIL NIL "BASE64" 4000 NIL ("ATTACHMENT" ("FILENAME" {18}',
+        'café "quote".png'.encode('utf-8')
+    ),
+    b')) NIL NIL) "MIXED" ("BOUNDARY" "x") NIL NIL NIL))',
+]
+
+FORWARDED_MESSAGE = [
+    b'3 (UID 103 BODYSTRUCTURE (("TEXT" "PLAIN" ("CHARSET" "us-ascii") NIL NIL "7BIT" 20 1 NIL NIL NIL NIL)'
+    b'("MESSAGE" "RFC822" NIL NIL NIL "7BIT" 500 (NIL "Fwd" NIL NIL NIL NIL NIL NIL NIL NIL) '
+    b'(("TEXT" "PLAIN" ("CHARSET" "us-ascii") NIL NIL "7BIT" 30 2 NIL NIL NIL NIL)'
+    b'("TEXT" "HTML" ("CHARSET" "us-ascii") NIL NIL "7BIT" 60 3 NIL NIL NIL NIL) "ALTERNATIVE" ("BOUNDARY" "in") NIL NIL NIL) '
+    b'12 NIL ("ATTACHMENT" ("FILENAME" "fwd.eml")) NIL NIL) "MIXED" ("BOUNDARY" "out") NIL NIL NIL))'
+]
+
+HEADER = b'Subject: Hello\r\nFrom: a@example.com\r\n\r\n'
+PLAIN = b'Hello =E2=9C=93\r\nbye'
+MULTI_LITERAL = [
+    (b'4 (UID 104 BODY[HEADER] {%d}' % len(HEADER), HEADER),
+    (b' BODY[1] {%d}' % len(PLAIN), PLAIN),
+    b' FLAGS (\\Seen))',
+    (b'5 (UID 105 BODY[HEADER] {%d}' % len(HEADER), HEADER),
+    b' BODY[1] NIL)',
+]
+
+
+def layout(parts):
+    """Section, content type and filename of each part."""
+    return [(part.section, part.content_type, part.filename) for part in parts]
+
+
+def test_nested_multipart():
+    """multipart/mixed holding multipart/alternative and a PDF attachment."""
+    fields = parse_fetch_response(NESTED_MULTIPART)[b'101']
+    parts = body_parts(fields[b'BODYSTRUCTURE'])
+    assert layout(parts) == [
+        ("TEXT", "multipart/mixed", None),
+        ("1", "multipart/alternative", None),
+        ("1.1", "text/plain", None),
+        ("1.2", "text/html", None),
+        ("2", "application/pdf", "report.pdf"),
+    ], layout(parts)
+    assert parts[2].encoding == "quoted-printable" and parts[2].octets == 120
+    assert parts[4].disposition == "attachment" and parts[4].octets == 78000
+
+
+def test_literal_filename():
+    """Filename sent as a literal, with a quote inside it."""
+    fields = parse_fetch_response(LITERAL_FILENAME)[b'102']
+    parts = body_parts(fields[b'BODYSTRUCTURE'])
+    assert layout(parts)[2] == ("2", "image/png", 'café "quote".png'), layout(parts)
+
+
+def test_forwarded_message():
+    """message/rfc822 attachment; its inner parts continue the numbering."""
+    fields = parse_fetch_response(FORWARDED_MESSAGE)[b'103']
+    parts = body_parts(fields[b'BODYSTRUCTURE'])
+    assert layout(parts) == [
+        ("TEXT", "multipart/mixed", None),
+        ("1", "text/plain", None),
+        ("2", "message/rfc822", "fwd.eml"),
+        ("2", "multipart/alternative", None),
+        ("2.1", "text/plain", None),
+        ("2.2", "text/html", None),
+    ], layout(parts)
+
+
+def test_multi_literal_body():
+    """Several literals per message, trailing attributes and a NIL section."""
+    messages = parse_fetch_response(MULTI_LITERAL)
+    assert sorted(messages) == [b'104', b'105'], sorted(messages)
+    assert messages[b'104'][b'BODY[HEADER]'] == HEADER
+    assert messages[b'104'][b'BODY[1]'] == PLAIN
+    assert messages[b'104'][b'FLAGS'] == [b'\\Seen']
+    assert messages[b'105'][b'BODY[1]'] is None
+    assert decode_section(messages[b'104'][b'BODY[1]'], "quoted-printable") == 'Hello ✓\r\nbye'.encode('utf-8')
+
+
+def test_sizes():
+    """Decoded sizes of base64 parts, estimated from their octets."""
+    payload = bytes(range(256)) * 40
+    encoded = base64.encodebytes(payload).replace(b"\n", b"\r\n")
+    assert decode_section(encoded, "base64") == payload
+    assert abs(estimate_size(len(encoded), "base64") - len(payload)) <= 3
+    assert estimate_size(500, "7bit") == 500
+
+
+def main():
+    """Run all parser checks."""
+    print("🚀 Checking IMAP FETCH response parsing")
+    print("=" * 50)
+    
+    checks = [
+        test_nested_multipart,
+        test_literal_filename,
+        test_forwarded_message,
+        test_multi_literal_body,
+        test_sizes,
+    ]
+    failed = 0
+    for check in checks:
+        try:
+            check()
+            print(f"✅ {check.__doc__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {check.__doc__}: {e!r}")
+    
+    print("=" * 50)
+    if failed:
+        print(f"⚠️  {failed} of {len(checks)} checks failed")
+        return False
+    print(f"🎉 All {len(checks)} checks passed")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
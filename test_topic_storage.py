@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Self-check for storing generated topics.
+Builds topics with TopicGenerator from a canned AI response and stores them in
+a temporary database; needs no network access or API keys.
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.ai.topic_generator import TopicGenerator
+from src.config.config_manager import get_config
+from src.database.operations import DatabaseManager
+
+
+# Processed email reports, as ContentAnalyzer.create_email_report builds them
+EMAILS = [
+    {
+        'subject': 'Rust 2.0 released',
+        'from': 'news@example.com',
+        'date': 'Mon, 5 Oct 2026 09:00:00 +0000',
+        'category': 'tech',
+        'content': 'The Rust team announced...',
+        'relevance_score': 0.9,
+        'quality_score': 0.8,
+    },
+    {
+        'subject': 'Weekly Python digest',
+        'from': 'digest@example.com',
+        'category': 'tech',
+        'content': 'This week in Python...',
+    },
+]
+
+# Topics as the AI provider returns them, before source emails are attached
+AI_TOPICS = [
+    {'title': 'What Rust 2.0 means', 'description': 'A look at the release', 'keywords': ['rust', 'release']},
+    {'title': 'Python this week', 'description': 'Digest roundup', 'keywords': 'python, news'},
+]
+
+
+def generate_topics(columnar: bool):
+    """Run TopicGenerator with the AI call replaced by the canned response."""
+    config = get_config()
+    config.ai.columnar_sources = columnar
+    generator = TopicGenerator()
+    
+    async def canned_response(prompt, max_tokens):
+        return [dict(topic) for topic in AI_TOPICS]
+    
+    generator._agenerate = canned_response
+    try:
+        return asyncio.run(generator._agenerate_category_topics('tech', EMAILS, 'summary'))
+    finally:
+        generator.close()
+
+
+def store_and_read_back(topics, batch: bool):
+    """Store topics in a fresh database and return the stored rows and statistics."""
+    config = get_config()
+    config.database.url = f"sqlite:///{tempfile.mkdtemp()}/topics.db"
+    db = DatabaseManager()
+    try:
+        if batch:
+            assert db.store_topics_batch(topics), "store_topics_batch failed"
+        else:
+            for topic in topics:
+                assert db.store_topic(topic), "store_topic failed"
+        
+        rows = db._conn.execute('SELECT title, keywords, source_emails FROM topics ORDER BY id').fetchall()
+        return rows, db.get_statistics()['topics_generated']
+    finally:
+        db.close()
+
+
+def check_stored(columnar: bool, batch: bool):
+    emails_before = [dict(email) for email in EMAILS]
+    topics = generate_topics(columnar)
+    assert len(topics) == len(AI_TOPICS), topics
+    assert EMAILS == emails_before, "TopicGenerator modified the email reports"
+    
+    rows, topics_generated = store_and_read_back(topics, batch)
+    assert topics_generated == len(AI_TOPICS), f"topics_generated is {topics_generated}"
+    assert [row[1] for row in rows] == ['rust,release', 'python, news'], rows
+    
+    source_emails = json.loads(rows[0][2])
+    assert [email['subject'] for email in source_emails] == ['Rust 2.0 released', 'Weekly Python digest']
+    assert source_emails[1]['from'] == 'digest@example.com'
+
+
+def test_store_topic():
+    """Topics stored one by one keep their source emails."""
+    check_stored(columnar=False, batch=False)
+
+
+def test_store_topics_batch():
+    """Topics stored in one batch keep their source emails."""
+    check_stored(columnar=False, batch=True)
+
+
+def test_columnar_sources():
+    """Columnar source emails are stored as one object per email."""
+    check_stored(columnar=True, batch=True)
+
+
+def main():
+    """Run all topic storage checks."""
+    print("🚀 Checking topic storage")
+    print("=" * 50)
+    
+    checks = [test_store_topic, test_store_topics_batch, test_columnar_sources]
+    failed = 0
+    for check in checks:
+        try:
+            check()
+            print(f"✅ {check.__doc__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {check.__doc__}: {e!r}")
+    
+    print("=" * 50)
+    if failed:
+        print(f"⚠️  {failed} of {len(checks)} checks failed")
+        return False
+    print(f"🎉 All {len(checks)} checks passed")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)